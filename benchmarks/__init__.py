@@ -0,0 +1,10 @@
+"""
+Benchmarks for the control-loop hot paths (vision, memory, navigation, UDP, GUI).
+
+Run from the repository root:
+
+    python -m benchmarks.run --out bench.json --baseline benchmarks/baseline.json
+
+Everything runs headless on a CPU-only box; benchmarks whose optional
+requirements are missing (real weights, ultralytics) are reported as skipped.
+"""
@@ -0,0 +1,102 @@
+# bench_gui.py
+"""
+gui.on_click / gui.draw_waypoints with hundreds of waypoints.
+
+Uses a real Tk canvas when a display is available, otherwise a headless
+canvas that records items, so the Python-side cost is measured either way.
+"""
+
+import gui
+from benchmarks import harness
+
+WAYPOINT_COUNTS = (100, 500)
+
+
+class HeadlessCanvas:
+    """Implements the few Canvas calls gui.py makes, keeping items in a dict."""
+
+    def __init__(self):
+        self.items = {}
+        self._next = 1
+
+    def _create(self, kind, coords, tags=None, **options):
+        item = self._next
+        self._next += 1
+        self.items[item] = (kind, coords, tags)
+        return item
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, **options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, **options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, **options)
+
+    def delete(self, tag):
+        self.items = {k: v for k, v in self.items.items() if v[2] != tag}
+
+
+class _Click:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+def _make_canvas():
+    """
+    Returns:
+        (canvas, backend name, cleanup callable)
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        return HeadlessCanvas(), "headless", lambda: None
+    canvas = tk.Canvas(root, width=gui.VIRTUAL_WIDTH, height=gui.VIRTUAL_HEIGHT)
+    return canvas, "tk", root.destroy
+
+
+def _route(count):
+    """
+    Returns:
+        list: Screen-space clicks that gui.on_click accepts, zig-zagging across the canvas
+    """
+    clicks = []
+    for i in range(count):
+        x = 300 if i % 2 == 0 else 1600                # dx always above MIN_DELTA_X
+        y = 200 + (i * 37) % 680                       # stays inside the edge margins
+        clicks.append(_Click(x, gui.VIRTUAL_HEIGHT - y))
+    return clicks
+
+
+def run(repeat=harness.DEFAULT_REPEAT):
+    """
+    Returns:
+        dict: Benchmark name -> result
+    """
+    canvas, backend, cleanup = _make_canvas()
+    saved = (gui.canvas, gui.recording, gui.scale_x, gui.scale_y, list(gui.waypoints))
+    gui.canvas, gui.recording, gui.scale_x, gui.scale_y = canvas, True, 1.0, 1.0
+    results = {}
+    try:
+        for count in WAYPOINT_COUNTS:
+            clicks = _route(count)
+
+            def record_route():
+                gui.waypoints.clear()
+                for click in clicks:
+                    gui.on_click(click)
+
+            results[f"gui.on_click.{count}.{backend}"] = harness.measure(
+                record_route, repeat=max(3, repeat // 10), warmup=1)
+
+            record_route()  # leave `count` waypoints in place for the redraw benchmark
+            results[f"gui.draw_waypoints.{count}.{backend}"] = harness.measure(
+                gui.draw_waypoints, repeat=repeat)
+    finally:
+        gui.canvas, gui.recording, gui.scale_x, gui.scale_y = saved[:4]
+        gui.waypoints[:] = saved[4]
+        cleanup()
+    return results
@@ -0,0 +1,50 @@
+# bench_memory.py
+"""
+Per-frame allocation of the vision path: the old flip-and-copy frame handling
+against the reused-buffer path, with display on and off.
+"""
+
+import cv2
+import yolo
+from benchmarks import harness
+from benchmarks.bench_vision import StubModel, fixed_frames
+
+
+def _copy_per_frame(frame, model, scale_x, scale_y):
+    """
+    The frame handling process_frame used to do: a mirrored copy for
+    inference plus a second copy to draw on, every frame.
+    """
+    mirrored = cv2.flip(frame, 1)
+    annotated = mirrored.copy()
+    yolo.process_frame(frame, model, scale_x, scale_y, annotate=False)
+    return annotated
+
+
+def _bench(step, frames, repeat):
+    scale_x, scale_y = yolo.calculate_scale_factors()
+    model = StubModel()
+    index = [0]
+
+    def call():
+        step(frames[index[0] % len(frames)], model, scale_x, scale_y)
+        index[0] += 1
+
+    result = harness.measure(call, repeat=repeat)
+    result.update(harness.measure_alloc(call, repeat=max(10, repeat // 2)))
+    return result
+
+
+def run(repeat=harness.DEFAULT_REPEAT):
+    """
+    Returns:
+        dict: Benchmark name -> result (timing plus alloc_peak_kb)
+    """
+    frames = fixed_frames()
+    return {
+        "memory.process_frame.copy_per_frame": _bench(_copy_per_frame, frames, repeat),
+        "memory.process_frame.display": _bench(
+            lambda f, m, sx, sy: yolo.process_frame(f, m, sx, sy, annotate=True), frames, repeat),
+        "memory.process_frame.headless": _bench(
+            lambda f, m, sx, sy: yolo.process_frame(f, m, sx, sy, annotate=False), frames, repeat),
+    }
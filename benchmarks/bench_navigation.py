@@ -0,0 +1,36 @@
+# bench_navigation.py
+"""
+navigation.calculate_from_pixels, single calls and batch forms.
+"""
+
+import numpy as np
+import navigation as NAV
+from benchmarks import harness
+
+BATCH_SIZE = 1000
+
+
+def run(repeat=harness.DEFAULT_REPEAT):
+    """
+    Returns:
+        dict: Benchmark name -> result
+    """
+    rng = np.random.default_rng(0)
+    starts = rng.uniform((0, 0), (1920, 1080), (BATCH_SIZE, 2))
+    ends = rng.uniform((0, 0), (1920, 1080), (BATCH_SIZE, 2))
+    start_list = [tuple(p) for p in starts.tolist()]
+    end_list = [tuple(p) for p in ends.tolist()]
+
+    def loop():
+        for s, e in zip(start_list, end_list):
+            NAV.calculate_from_pixels(s, e)
+
+    return {
+        "navigation.calculate_from_pixels.single": harness.measure(
+            lambda: NAV.calculate_from_pixels(start_list[0], end_list[0]), repeat=repeat * 20),
+        f"navigation.calculate_from_pixels.loop{BATCH_SIZE}": harness.measure(loop, repeat=repeat),
+        f"navigation.moves_from_pixels_batch.{BATCH_SIZE}": harness.measure(
+            lambda: NAV.moves_from_pixels_batch(starts, ends), repeat=repeat),
+        f"navigation.calculate_from_pixels_batch.{BATCH_SIZE}": harness.measure(
+            lambda: NAV.calculate_from_pixels_batch(starts, ends), repeat=repeat),
+    }
@@ -0,0 +1,45 @@
+# bench_udp.py
+"""
+udp_sender.send_tello round trips against a local loopback echo server.
+"""
+
+import socket
+import threading
+import udp_sender as UDP
+from benchmarks import harness
+
+
+def _echo_server(sock, stop):
+    """Answer every datagram with 'ok', like the Tello does for most commands."""
+    while not stop.is_set():
+        try:
+            _, addr = sock.recvfrom(1024)
+        except socket.timeout:
+            continue
+        sock.sendto(b"ok", addr)
+
+
+def run(repeat=harness.DEFAULT_REPEAT):
+    """
+    Returns:
+        dict: Benchmark name -> result
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(0.1)
+    stop = threading.Event()
+    echo = threading.Thread(target=_echo_server, args=(server, stop), daemon=True)
+    echo.start()
+
+    saved = (UDP.TELLO_IP, UDP.TELLO_PORT, UDP.LOCAL_IPS, UDP.LOCAL_PORT)
+    UDP.TELLO_IP, UDP.TELLO_PORT = server.getsockname()
+    UDP.LOCAL_IPS, UDP.LOCAL_PORT = ["127.0.0.1"], 0  # ephemeral port, never clashes with a real session
+    try:
+        UDP.connect()
+        return {"udp.send_tello.loopback": harness.measure(lambda: UDP.send_tello("command"), repeat=repeat * 4)}
+    finally:
+        UDP.close_socket()
+        UDP.TELLO_IP, UDP.TELLO_PORT, UDP.LOCAL_IPS, UDP.LOCAL_PORT = saved
+        stop.set()
+        echo.join()  # server.settimeout bounds this to one timeout period
+        server.close()
@@ -0,0 +1,104 @@
+# bench_vision.py
+"""
+yolo.process_frame on fixed frames, with a stub model and with the real weights.
+"""
+
+import os
+import numpy as np
+import yolo
+from benchmarks import harness
+
+
+class _Array:
+    """Stands in for a torch tensor: supports [0] and .cpu().numpy()."""
+
+    def __init__(self, values):
+        self._values = np.asarray(values, dtype=np.float32)
+
+    def __getitem__(self, index):
+        return _Array(self._values[index])
+
+    def __float__(self):
+        return float(self._values)
+
+    def __int__(self):
+        return int(self._values)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._values
+
+
+class _Box:
+    def __init__(self, cls_id, conf, xyxy):
+        self.cls = _Array([cls_id])
+        self.conf = _Array([conf])
+        self.xyxy = _Array([xyxy])
+
+
+class _Result:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+
+class StubModel:
+    """
+    Model replacement with no inference cost, so the benchmark isolates the
+    pre/post-processing, tracking and drawing done around the model call.
+    The single drone box drifts a few pixels per call like a slow flight.
+    """
+
+    def __init__(self, extra_boxes=2):
+        self.calls = 0
+        self.extra_boxes = extra_boxes  # low-confidence clutter for the tracker
+
+    def __call__(self, frame, **kwargs):
+        self.calls += 1
+        x = 400 + (self.calls * 3) % 1000
+        boxes = [_Box(0, 0.9, [x, 500, x + 60, 540])]
+        for i in range(self.extra_boxes):
+            boxes.append(_Box(0, 0.2, [100 + 300 * i, 200, 140 + 300 * i, 230]))
+        return [_Result(boxes)]
+
+
+def fixed_frames(count=8, seed=0):
+    """
+    Returns:
+        list: Deterministic PROC_H x PROC_W BGR frames
+    """
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (yolo.PROC_H, yolo.PROC_W, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def _bench_process_frame(model, frames, repeat):
+    scale_x, scale_y = yolo.calculate_scale_factors()
+    index = [0]
+
+    def step():
+        yolo.process_frame(frames[index[0] % len(frames)], model, scale_x, scale_y)
+        index[0] += 1
+
+    return harness.measure(step, repeat=repeat)
+
+
+def run(repeat=harness.DEFAULT_REPEAT, weights=None):
+    """
+    Returns:
+        dict: Benchmark name -> result
+    """
+    frames = fixed_frames()
+    results = {"vision.process_frame.stub": _bench_process_frame(StubModel(), frames, repeat)}
+
+    weights = weights or yolo.WEIGHTS
+    if not os.path.exists(weights):
+        results["vision.process_frame.real"] = harness.skipped(f"weights not found: {weights}")
+        return results
+    try:
+        model = yolo.load_model(weights)
+    except ImportError as exc:
+        results["vision.process_frame.real"] = harness.skipped(f"ultralytics unavailable: {exc}")
+        return results
+    results["vision.process_frame.real"] = _bench_process_frame(model, frames, max(5, repeat // 5))
+    return results
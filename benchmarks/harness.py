@@ -0,0 +1,109 @@
+# harness.py
+"""
+Timing, result recording and baseline comparison shared by all benchmarks.
+"""
+
+import json
+import time
+import tracemalloc
+import platform
+import statistics
+
+DEFAULT_REPEAT = 50     # timed calls per benchmark
+DEFAULT_WARMUP = 5      # untimed calls before timing starts
+DEFAULT_THRESHOLD = 0.15  # allowed median slow-down vs baseline (15 %)
+
+
+def measure(fn, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """
+    Time repeated calls of fn().
+
+    Returns:
+        dict: n, mean_ms, median_ms, p90_ms, min_ms
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    samples.sort()
+    return {
+        "n": repeat,
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "p90_ms": samples[min(len(samples) - 1, int(0.9 * len(samples)))],
+        "min_ms": samples[0],
+    }
+
+
+def measure_alloc(fn, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """
+    Peak memory allocated inside each call of fn(), traced separately from
+    the timing run because tracing slows every allocation down.
+
+    Returns:
+        dict: alloc_peak_kb (median) and alloc_peak_kb_max
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        tracemalloc.start()  # a fresh trace per call gives its own peak (reset_peak() needs Python 3.9)
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        samples.append(peak / 1024)
+    return {"alloc_peak_kb": statistics.median(samples), "alloc_peak_kb_max": max(samples)}
+
+
+def skipped(reason):
+    """
+    Returns:
+        dict: Result entry for a benchmark that could not run here
+    """
+    return {"skipped": reason}
+
+
+def environment():
+    """
+    Returns:
+        dict: Machine description stored alongside every result file
+    """
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path):
+    with open(path, "w") as fh:
+        json.dump({"env": environment(), "results": results}, fh, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as fh:
+        return json.load(fh)["results"]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare medians against a baseline.
+
+    Returns:
+        list: (name, baseline ms, current ms, ratio, regressed) per benchmark present in both
+    """
+    rows = []
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if not base or "median_ms" not in base or "median_ms" not in current:
+            continue
+        ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        rows.append((name, base["median_ms"], current["median_ms"], ratio, ratio > 1 + threshold))
+    return rows
@@ -0,0 +1,93 @@
+# run.py
+"""
+Run the benchmark suite, write results as JSON and compare against a baseline.
+
+    python -m benchmarks.run                                  # run everything, print a table
+    python -m benchmarks.run --out bench.json                 # also save results
+    python -m benchmarks.run --save-baseline                  # store results as the new baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.15
+
+Exits with status 1 when any median is slower than baseline * (1 + threshold).
+"""
+
+import os
+import sys
+import argparse
+from benchmarks import harness
+
+SUITES = ("vision", "memory", "navigation", "udp", "gui")
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def run_suite(name, repeat, weights):
+    if name == "vision":
+        from benchmarks import bench_vision
+        return bench_vision.run(repeat=repeat, weights=weights)
+    if name == "memory":
+        from benchmarks import bench_memory
+        return bench_memory.run(repeat=repeat)
+    if name == "navigation":
+        from benchmarks import bench_navigation
+        return bench_navigation.run(repeat=repeat)
+    if name == "udp":
+        from benchmarks import bench_udp
+        return bench_udp.run(repeat=repeat)
+    if name == "gui":
+        from benchmarks import bench_gui
+        return bench_gui.run(repeat=repeat)
+    raise ValueError(f"unknown suite: {name}")
+
+
+def print_results(results):
+    print(f"{'benchmark':<52} {'median ms':>10} {'p90 ms':>10} {'alloc KB':>10}")
+    for name, result in sorted(results.items()):
+        if "skipped" in result:
+            print(f"{name:<52} {'skipped':>10}  {result['skipped']}")
+        else:
+            alloc = f"{result['alloc_peak_kb']:>10.1f}" if "alloc_peak_kb" in result else ""
+            print(f"{name:<52} {result['median_ms']:>10.3f} {result['p90_ms']:>10.3f} {alloc}".rstrip())
+
+
+def print_comparison(rows, threshold):
+    print(f"\n{'benchmark':<52} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+    for name, base, now, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<52} {base:>10.3f} {now:>10.3f} {ratio:>7.2f}{flag}")
+    print(f"(threshold: +{threshold:.0%} on the median)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES, help="suites to run")
+    parser.add_argument("--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed calls per benchmark")
+    parser.add_argument("--weights", help="weights for the real-model vision benchmark (default: yolo.WEIGHTS)")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                        help="allowed median slow-down as a fraction (0.15 = 15%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for suite in args.only:
+        results.update(run_suite(suite, args.repeat, args.weights))
+    print_results(results)
+
+    if args.out:
+        harness.save(results, args.out)
+        print(f"\nResults written to {args.out}")
+    if args.save_baseline:
+        harness.save(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    rows = harness.compare(results, harness.load(args.baseline), args.threshold)
+    print_comparison(rows, args.threshold)
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
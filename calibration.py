@@ -0,0 +1,157 @@
+# calibration.py
+"""
+Online gain calibration for pixel-to-centimetre moves.
+
+navigation.py converts pixel error to centimetres with one fixed scale
+(PIXEL_REF px = REAL_CM_REF cm) on both axes. When the camera height, lens or
+mounting differs from that reference, every move over- or undershoots and
+retry_to_reach needs extra attempts.
+
+The GainCalibrator watches what actually happens: for every command it records
+the confirmed vision fix before and after, and estimates how many output pixels
+the drone really moves per commanded centimetre on each axis. It uses
+least squares through the origin with a forgetting factor, so the estimate
+tracks slow changes such as battery sag. Later commands are computed with
+those gains. The estimates are saved to CALIBRATION_FILE under a key for the
+camera setup, so the next flight with the same setup starts calibrated.
+
+Axes are in drone terms, after navigation's 90° rotation:
+    forward  = +x in output pixels
+    sideways = -y in output pixels (right is up the output frame)
+"""
+
+import os
+import json
+import threading
+import navigation as NAV
+
+CALIBRATION_FILE = "calibration.json"
+DEFAULT_GAIN = NAV.PIXEL_REF / NAV.REAL_CM_REF  # px per cm from the fixed reference
+PRIOR_WEIGHT = 400.0   # cm² of evidence the default (or stored) gain counts for
+FORGET = 0.9           # weight kept by old evidence at each new observation
+MIN_OBSERVE_CM = 20    # shorter commands are too noisy to learn from
+GAIN_BOUNDS = (0.4, 2.5)  # accepted ratio of an observed gain to the current one; outside = bad fix
+
+AXES = ("forward", "sideways")
+
+
+def setup_key(cam_idx, fourcc, width, height, weights=None):
+    """
+    Args:
+        cam_idx (int): Camera index
+        fourcc (str): Pixel format the driver granted
+        width, height (int): Size of the frames the camera actually delivers
+        weights (str or None): Model weights, whose boxes the fixes come from
+    Returns:
+        str: Key identifying a camera setup in the calibration file
+    """
+    key = f"cam{cam_idx}_{fourcc}_{width}x{height}"
+    return f"{key}_{os.path.basename(weights)}" if weights else key
+
+
+class GainCalibrator:
+    """
+    Per-axis pixels-per-centimetre estimates learned from observed moves.
+    """
+
+    def __init__(self, key, path=CALIBRATION_FILE):
+        self.key = key
+        self.path = path
+        self.gain = {axis: DEFAULT_GAIN for axis in AXES}        # px per commanded cm
+        self.weight = {axis: PRIOR_WEIGHT for axis in AXES}      # sum of cm² behind each estimate
+        self.samples = {axis: 0 for axis in AXES}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """
+        Restore the estimates stored for this setup, if any.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as fh:
+                stored = json.load(fh).get(self.key)
+        except (OSError, ValueError) as e:
+            print(f"[CALIB] Could not read {self.path}: {e}")
+            return
+        if not stored:
+            return
+        for axis in AXES:
+            if axis in stored:
+                self.gain[axis] = float(stored[axis]["gain"])
+                self.samples[axis] = int(stored[axis].get("samples", 0))
+        print(f"[CALIB] Loaded {self.key}: " + ", ".join(f"{a} {self.gain[a]:.2f} px/cm" for a in AXES))
+
+    def save(self):
+        """
+        Write the estimates for this setup, keeping other setups in the file.
+        """
+        with self._lock:
+            entry = {axis: {"gain": round(self.gain[axis], 4), "samples": self.samples[axis]} for axis in AXES}
+        data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as fh:
+                    data = json.load(fh)
+            except (OSError, ValueError):
+                data = {}  # unreadable file: rewrite it
+        data[self.key] = entry
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(tmp, self.path)  # atomic, so a crash mid-write never loses the old file
+
+    def moves(self, start_px, end_px):
+        """
+        Returns:
+            (forward_cm, sideways_cm): Integer commands expected to cover the pixel error
+        """
+        with self._lock:
+            forward = (end_px[0] - start_px[0]) / self.gain["forward"]
+            sideways = -(end_px[1] - start_px[1]) / self.gain["sideways"]
+        return round(forward), round(sideways)
+
+    def commands(self, start_px, end_px):
+        """
+        Calibrated counterpart of navigation.calculate_from_pixels.
+
+        Returns:
+            (forward_cmd, sideways_cmd)
+        """
+        return NAV.calculate_udp(*self.moves(start_px, end_px))
+
+    def observe(self, axis, commanded_cm, before_px, after_px):
+        """
+        Learn from one executed move.
+
+        Args:
+            axis (str): "forward" or "sideways"
+            commanded_cm (int): Signed distance actually sent (after any minimum bump)
+            before_px, after_px (tuple): Confirmed fixes around the move
+        Returns:
+            bool: True if the observation was used
+        """
+        if before_px is None or after_px is None or abs(commanded_cm) < MIN_OBSERVE_CM:
+            return False
+        if axis == "forward":
+            moved_px = after_px[0] - before_px[0]
+        else:
+            moved_px = -(after_px[1] - before_px[1])
+
+        with self._lock:
+            observed = moved_px / commanded_cm
+            low, high = GAIN_BOUNDS
+            if not low * self.gain[axis] <= observed <= high * self.gain[axis]:
+                print(f"[CALIB] Ignoring {axis} sample {observed:.2f} px/cm "
+                      f"(estimate {self.gain[axis]:.2f}); fix jumped or drone drifted")
+                return False
+            # Least squares through the origin: gain = Σ(px·cm) / Σ(cm²), with old evidence decayed
+            weight = FORGET * self.weight[axis]
+            new_weight = weight + commanded_cm ** 2
+            self.gain[axis] = (self.gain[axis] * weight + moved_px * commanded_cm) / new_weight
+            self.weight[axis] = new_weight
+            self.samples[axis] += 1
+            print(f"[CALIB] {axis}: {commanded_cm:+d} cm moved {moved_px:+.0f} px "
+                  f"-> {self.gain[axis]:.2f} px/cm ({self.samples[axis]} samples)")
+        return True
@@ -0,0 +1,226 @@
+# camera.py
+"""
+Capture layer for the external camera.
+
+Negotiates the pixel format before the resolution (MJPG first, raw formats as
+fallback), because many USB cameras silently fall back to raw YUYV at 1080p,
+which USB 2.0 caps at about 5 fps. Reports the format, size and FPS actually
+granted and the capture rate measured over the first frames.
+
+Optionally the camera's JPEG stream is decoded here instead of inside the
+backend, at reduced scale: libjpeg (or TurboJPEG when installed) scales in
+the DCT domain, so a 1080p frame decodes straight to about the inference size
+for a fraction of the full decode cost.
+"""
+
+import time
+import cv2
+
+FOURCC_PREFERENCE = ("MJPG", "YUYV", "YUY2", "NV12")  # tried in order
+REPORT_AFTER = 60  # frames to measure before printing the capture rate
+DROP_REPORT_EVERY = 100  # print the corrupt-frame count every N drops
+
+# cv2.imdecode flags for DCT-domain downscaling by 1, 2, 4, 8
+_REDUCED_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+try:
+    from turbojpeg import TurboJPEG  # optional, faster than OpenCV's bundled libjpeg
+    _turbo = TurboJPEG()
+except Exception:
+    _turbo = None
+
+
+def fourcc_to_str(value):
+    """
+    Returns:
+        str: Four-character code for a CAP_PROP_FOURCC value
+    """
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def reduction_for(width, target_width):
+    """
+    Returns:
+        int: Largest DCT scale divisor (1, 2, 4, 8) that keeps the width >= target_width
+    """
+    factor = 1
+    for candidate in (2, 4, 8):
+        if width // candidate >= target_width:
+            factor = candidate
+    return factor
+
+
+def decode_jpeg(buf, reduction=1):
+    """
+    Decode a JPEG buffer, downscaling in the DCT domain.
+
+    Args:
+        buf (ndarray): Raw JPEG bytes as a uint8 array
+        reduction (int): 1, 2, 4 or 8
+    Returns:
+        ndarray or None: BGR image
+    """
+    if _turbo is not None:
+        try:
+            return _turbo.decode(buf.tobytes(), scaling_factor=(1, reduction))
+        except Exception:
+            pass  # fall through to OpenCV on a corrupt or unsupported frame
+    return cv2.imdecode(buf, _REDUCED_FLAGS[reduction])
+
+
+class Camera:
+    """
+    cv2.VideoCapture wrapper with format negotiation, optional self-decoding
+    of MJPEG at reduced scale, and capture-rate measurement.
+
+    Exposes isOpened/read/release/get/set, so it drops in where a
+    VideoCapture was used.
+    """
+
+    def __init__(self, cap, fourcc, width, height, fps, reduction=1):
+        self.cap = cap
+        self.fourcc = fourcc       # format actually granted by the driver
+        self.width, self.height = width, height  # size the camera delivers
+        self.fps = fps             # FPS the driver reports
+        self.reduction = reduction # >1 when we decode JPEG ourselves
+        self.frame_size = (width // reduction, height // reduction)  # size of frames returned by read()
+        self.measured_fps = None
+        self.dropped = 0           # corrupt JPEG frames skipped by read()
+        self._count = 0
+        self._start = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def release(self):
+        self.cap.release()
+
+    def _measure(self):
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+            return
+        self._count += 1
+        if self._count == REPORT_AFTER:
+            self.measured_fps = self._count / (now - self._start)
+            print(f"[CAMERA] {self.describe()}, measured {self.measured_fps:.1f} fps")
+
+    def describe(self):
+        decode = f", self-decoded 1/{self.reduction} -> {self.frame_size[0]}x{self.frame_size[1]}" \
+            if self.reduction > 1 else ""
+        dropped = f", {self.dropped} corrupt frames dropped" if self.dropped else ""
+        return f"{self.fourcc} {self.width}x{self.height} @ {self.fps:.0f} fps reported{decode}{dropped}"
+
+    def read(self, image=None):
+        """
+        A JPEG that fails to decode (USB MJPEG cameras send the odd corrupt
+        frame) is dropped and the next one read; only a failed grab is
+        reported as failure.
+
+        Returns:
+            (bool, ndarray): Like cv2.VideoCapture.read
+        """
+        if self.reduction == 1:
+            ok, frame = self.cap.read() if image is None else self.cap.read(image=image)
+        else:
+            frame = None
+            while frame is None:
+                ok, raw = self.cap.read()
+                if not ok:
+                    break
+                frame = decode_jpeg(raw.reshape(-1), self.reduction)
+                if frame is None:
+                    self.dropped += 1
+                    if self.dropped % DROP_REPORT_EVERY == 1:
+                        print(f"[CAMERA] Corrupt JPEG frame dropped ({self.dropped} so far)")
+        if ok:
+            self._measure()
+        return ok, frame
+
+
+def _try_format(index, fourcc, width, height, fps, backend):
+    cap = cv2.VideoCapture(index, backend)
+    if not cap.isOpened():
+        return None
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))  # format first: size may depend on it
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    granted = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    if granted.upper() != fourcc or size != (width, height):
+        cap.release()
+        return None
+    return cap, granted, size, cap.get(cv2.CAP_PROP_FPS)
+
+
+def _enable_raw_jpeg(cap):
+    """
+    Ask the backend to hand over undecoded MJPEG buffers.
+
+    Returns:
+        bool: True if read() now yields raw JPEG bytes
+    """
+    if not cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+        return False
+    ok, raw = cap.read()
+    if ok and raw is not None and (raw.ndim == 1 or raw.shape[0] == 1) and raw.size > 2 \
+            and raw.reshape(-1)[0] == 0xFF and raw.reshape(-1)[1] == 0xD8:  # JPEG SOI marker
+        return True
+    cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)  # backend ignored the request; keep its decoder
+    return False
+
+
+def open_camera(index, width, height, fps=30, fourccs=FOURCC_PREFERENCE,
+                decode_width=None, backend=cv2.CAP_ANY):
+    """
+    Open a camera, negotiating the first format in `fourccs` that the driver
+    grants at the requested size.
+
+    Args:
+        index (int): Camera index
+        width, height (int): Requested capture size
+        fps (int): Requested frame rate
+        fourccs (tuple): Formats to try, best first
+        decode_width (int or None): When set and MJPG was granted, decode JPEG
+            here, downscaled in the DCT domain to no less than this width
+        backend (int): cv2.CAP_* backend (e.g. CAP_V4L2, CAP_DSHOW, CAP_MSMF)
+    Returns:
+        Camera
+    """
+    for fourcc in fourccs:
+        result = _try_format(index, fourcc, width, height, fps, backend)
+        if result is None:
+            continue
+        cap, granted, (w, h), got_fps = result
+        reduction = 1
+        if decode_width and granted.upper() == "MJPG":
+            factor = reduction_for(w, decode_width)
+            if factor > 1 and _enable_raw_jpeg(cap):
+                reduction = factor
+        camera = Camera(cap, granted, w, h, got_fps, reduction)
+        print(f"[CAMERA] Negotiated {camera.describe()}")
+        return camera
+
+    # Nothing matched exactly: take whatever the driver gives and report it
+    cap = cv2.VideoCapture(index, backend)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    camera = Camera(cap, fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+                    int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                    cap.get(cv2.CAP_PROP_FPS))
+    print(f"[CAMERA] No preferred format at {width}x{height}; fell back to {camera.describe()}")
+    return camera
@@ -1,55 +1,232 @@
 import time  # time delays
+import socket  # UDP reachability probe
+import threading  # probe runs alongside association
 import subprocess  # shell commands
 import platform  # OS detection
+import shutil  # locate nmcli
 import atexit  # exit handler
+import udp_sender  # drone address for the probe
 
 TELLO_SSID = "TELLO-E9C59F"  # drone network SSID
-CHECK_INTERVAL = 2  # seconds between connection attempts
+CONNECT_DEADLINE = 60  # seconds before connect_to_tello gives up
+POLL_MIN = 0.1  # first poll interval after issuing a connect, seconds
+POLL_MAX = 1.0  # poll interval cap for the exponential backoff, seconds
+RETRY_AFTER = 8  # seconds an idle, unsuccessful attempt is given before reissuing connect
+PROBE_TIMEOUT = 0.5  # seconds to wait for the drone's reply to each 'command' probe
+WIFI_IFNAME = None  # Wi-Fi interface nmcli should use (e.g. "wlan0"); None picks the first Wi-Fi device
 
 _saved_ssid = None
 
-def get_current_wifi():
+
+class NetshBackend:
     """
-    Returns:
-        str or None: current SSID if on Windows, else None
+    Windows WLAN control through netsh.
     """
-    try:
-        output = subprocess.check_output(
-            ["netsh", "wlan", "show", "interfaces"], text=True
-        )  # query WLAN status
-        for line in output.splitlines():
+    name = "netsh"
+
+    def _interfaces(self):
+        try:
+            return subprocess.check_output(
+                ["netsh", "wlan", "show", "interfaces"], text=True
+            )  # query WLAN status
+        except Exception:
+            return ""
+
+    def current_ssid(self):
+        """
+        Returns:
+            str or None: SSID of the associated network
+        """
+        for line in self._interfaces().splitlines():
             if "SSID" in line and "BSSID" not in line:
                 return line.split(":", 1)[1].strip()  # extract SSID
-    except Exception:
-        pass
+        return None
+
+    def is_connecting(self):
+        """
+        Returns:
+            bool: True while the adapter is associating or authenticating
+        """
+        for line in self._interfaces().splitlines():
+            key, _, value = line.partition(":")
+            if key.strip() == "State":
+                return value.strip() in ("associating", "authenticating", "discovering")
+        return False
+
+    def connect(self, ssid):
+        """
+        Start joining a saved profile; returns once the request is issued.
+        """
+        try:
+            subprocess.run(
+                ["netsh", "wlan", "connect", f"name={ssid}"],
+                stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL, check=True
+            )  # connect by profile name
+        except Exception:
+            return False
+        return True
+
+    def disconnect(self):
+        try:
+            subprocess.run(["netsh", "wlan", "disconnect"],
+                           stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL, check=True)
+        except Exception:
+            pass  # ignore failures
+
+
+class NmcliBackend:
+    """
+    Linux WLAN control through NetworkManager's nmcli.
+    """
+    name = "nmcli"
+
+    def __init__(self, ifname=WIFI_IFNAME):
+        self._proc = None  # background 'nmcli device wifi connect' while it runs
+        self._ifname = ifname
+
+    def ifname(self):
+        """
+        Returns:
+            str or None: Wi-Fi interface to control (the first Wi-Fi device unless WIFI_IFNAME is set)
+        """
+        if self._ifname is None:
+            try:
+                output = subprocess.check_output(
+                    ["nmcli", "-t", "-f", "DEVICE,TYPE", "device"], text=True
+                )
+            except Exception:
+                return None
+            for line in output.splitlines():
+                device, _, kind = line.partition(":")
+                if kind == "wifi":
+                    self._ifname = device
+                    break
+        return self._ifname
+
+    def current_ssid(self):
+        ifname = self.ifname()
+        try:
+            # --rescan no: answer from the cached scan list, never start a scan in the middle of association
+            output = subprocess.check_output(
+                ["nmcli", "-t", "-f", "ACTIVE,SSID", "device", "wifi", "list"]
+                + (["ifname", ifname] if ifname else []) + ["--rescan", "no"], text=True
+            )
+        except Exception:
+            return None
+        for line in output.splitlines():
+            active, _, ssid = line.partition(":")
+            if active == "yes":
+                return ssid.replace("\\:", ":")  # nmcli escapes colons in terse mode
+        return None
+
+    def is_connecting(self):
+        if self._proc is not None and self._proc.poll() is None:
+            return True  # our own connect request is still running
+        try:
+            output = subprocess.check_output(
+                ["nmcli", "-t", "-f", "TYPE,STATE", "device"], text=True
+            )
+        except Exception:
+            return False
+        return any(line.startswith("wifi:connecting") for line in output.splitlines())
+
+    def connect(self, ssid):
+        ifname = self.ifname()
+        try:
+            self._proc = subprocess.Popen(
+                ["nmcli", "--wait", str(RETRY_AFTER), "device", "wifi", "connect", ssid]
+                + (["ifname", ifname] if ifname else []),
+                stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL
+            )  # non-blocking: progress is polled through is_connecting()
+        except Exception:
+            return False
+        return True
+
+    def disconnect(self):
+        ifname = self.ifname()
+        if ifname is None:
+            return
+        try:
+            # Only the Wi-Fi device: Ethernet and the swarm's extra adapters stay up
+            subprocess.run(["nmcli", "device", "disconnect", ifname], check=True,
+                           stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+        except Exception:
+            pass  # ignore failures
+
+
+class FakeBackend:
+    """
+    In-memory backend for tests: joins the requested SSID after a delay.
+    """
+    name = "fake"
+
+    def __init__(self, current=None, join_delay=0.5, fail=False):
+        self.current = current
+        self.join_delay = join_delay
+        self.fail = fail
+        self.calls = []  # (method, argument) log for assertions
+        self._target = None
+        self._joined_at = None
+
+    def current_ssid(self):
+        if self._target and time.monotonic() >= self._joined_at:
+            self.current, self._target = self._target, None
+        return self.current
+
+    def is_connecting(self):
+        return self._target is not None and time.monotonic() < self._joined_at
+
+    def connect(self, ssid):
+        self.calls.append(("connect", ssid))
+        if self.fail:
+            return False
+        self._target = ssid
+        self._joined_at = time.monotonic() + self.join_delay
+        return True
+
+    def disconnect(self):
+        self.calls.append(("disconnect", None))
+        self.current = None
+
+
+def select_backend():
+    """
+    Returns:
+        backend or None: Wi-Fi control for this OS, None when unsupported
+    """
+    system = platform.system()
+    if system == "Windows":
+        return NetshBackend()
+    if system == "Linux" and shutil.which("nmcli"):
+        return NmcliBackend()
     return None
 
+
+backend = select_backend()  # replace with FakeBackend() in tests
+
+
+def get_current_wifi():
+    """
+    Returns:
+        str or None: current SSID, or None if unknown/unsupported
+    """
+    return backend.current_ssid() if backend else None
+
 def disconnect_wifi():
     """
-    Disconnects current Wi-Fi on Windows.
+    Disconnects current Wi-Fi.
     """
-    try:
-        subprocess.run(["netsh", "wlan", "disconnect"], check=True)
-    except Exception:
-        pass  # ignore failures
+    if backend:
+        backend.disconnect()
 
 def attempt_connect(ssid):
     """
     Args:
         ssid (str): SSID to connect
     Returns:
-        bool: True if now connected, else False
+        bool: True if the connect request was issued
     """
-    if platform.system() != "Windows":
-        return False
-    try:
-        subprocess.run(
-            ["netsh", "wlan", "connect", f"name={ssid}"],
-            stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL, check=True
-        )  # connect by profile name
-    except Exception:
-        return False
-    return get_current_wifi() == ssid  # verify
+    return backend.connect(ssid) if backend else False
 
 def save_current_ssid():
     """
@@ -71,29 +248,90 @@ def restore_saved_ssid():
 
 atexit.register(restore_saved_ssid)  # ensure restore on exit
 
-def connect_to_tello():
+def probe_drone(reachable, stop, addr=None):
+    """
+    Send 'command' until the drone answers, so reachability is known as soon
+    as the link carries traffic rather than after a fixed wait.
+
+    Args:
+        reachable (Event): Set when the drone replies
+        stop (Event): Set by the caller to abandon probing
+        addr (tuple or None): (ip, port) to probe, defaults to the Tello
     """
-    Loops until drone SSID is active.
+    addr = addr or (udp_sender.TELLO_IP, udp_sender.TELLO_PORT)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)  # ephemeral port, leaves LOCAL_PORT free
+    sock.settimeout(PROBE_TIMEOUT)
+    try:
+        while not stop.is_set():
+            try:
+                sock.sendto(b"command", addr)
+                resp, _ = sock.recvfrom(1024)
+            except socket.timeout:
+                continue  # already waited PROBE_TIMEOUT for a reply: resend at once
+            except OSError:
+                stop.wait(PROBE_TIMEOUT)  # no route yet: back off before the next send
+                continue
+            if resp.strip() == b"ok":
+                reachable.set()
+                return
+    finally:
+        sock.close()
+
+def connect_to_tello(ssid=TELLO_SSID, deadline=CONNECT_DEADLINE, probe_addr=None):
     """
-    print(f"[WIFI] Trying to join {TELLO_SSID}...")
-    while True:
-        current = get_current_wifi()  # check active SSID
-        if current == TELLO_SSID:
-            print(f"[WIFI] Connected to {TELLO_SSID}")
-            break
-        disconnect_wifi()  # drop existing
-        attempt_connect(TELLO_SSID)  # try join
-        time.sleep(CHECK_INTERVAL)  # wait before retry
+    Join the drone network and confirm the drone answers.
+
+    Polls with exponential backoff, never interrupts an association that is
+    already in progress, and probes the drone in parallel.
+
+    Returns:
+        bool: True once the drone replied to 'command' before the deadline
+    """
+    print(f"[WIFI] Trying to join {ssid} via {backend.name if backend else 'probe only'}...")
+    start = time.monotonic()
+    end = start + deadline
+    reachable, stop = threading.Event(), threading.Event()
+    threading.Thread(target=probe_drone, args=(reachable, stop, probe_addr), daemon=True).start()
+
+    linked = False
+    issued_at = None  # when the last connect request went out
+    delay = POLL_MIN
+    try:
+        while time.monotonic() < end:
+            if reachable.is_set():
+                print(f"[WIFI] Drone reachable after {time.monotonic() - start:.1f}s")
+                return True
+            if backend and not linked:
+                if get_current_wifi() == ssid:
+                    linked = True
+                    print(f"[WIFI] Connected to {ssid} after {time.monotonic() - start:.1f}s")
+                elif not backend.is_connecting():
+                    stale = issued_at is not None and time.monotonic() - issued_at >= RETRY_AFTER
+                    if issued_at is None or stale:
+                        if stale:
+                            disconnect_wifi()  # last attempt went nowhere; clear the adapter first
+                        attempt_connect(ssid)  # try join
+                        issued_at = time.monotonic()
+                        delay = POLL_MIN
+            reachable.wait(max(0.0, min(delay, end - time.monotonic())))  # returns early if the probe succeeds
+            delay = min(delay * 2, POLL_MAX)
+    finally:
+        stop.set()
+    print(f"[WIFI] Gave up after {deadline}s (linked={linked}, drone reachable=False)")
+    return False
 
 def run():
     """
     Saves original SSID, then connects to drone.
+
+    Returns:
+        bool: True if the drone is reachable
     """
-    if platform.system() != "Windows":
-        print("[WIFI] Unsupported OS. Exiting.")
-        return
-    save_current_ssid()  # preserve before change
-    connect_to_tello()  # join drone network
+    if backend is None:
+        print(f"[WIFI] No Wi-Fi backend for {platform.system()}; only probing the drone.")
+    else:
+        save_current_ssid()  # preserve before change
+    return connect_to_tello()  # join drone network
 
 if __name__ == "__main__":
     run()  # start process
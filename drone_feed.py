@@ -6,7 +6,8 @@ Displays the live camera feed in a fixed-size, borderless PIP snapped to the bot
 
 import time
 import cv2
-from ctypes import windll
+import monitor_server  # Optional live-monitoring HTTP server
+import visual_odometry # Fallback position estimate from this feed
 
 # Configuration
 TELLO_PORT = 11111       # UDP port where Tello streams video
@@ -56,6 +57,7 @@ def position_window(name):
     """
     Uses Win32 APIs to make the window borderless, always-on-top and snap the window to the bottom-right corner.
     """
+    from ctypes import windll  # Win32 only; imported here so the module loads on any OS
     sw = windll.user32.GetSystemMetrics(0)  # screen width
     sh = windll.user32.GetSystemMetrics(1)  # screen height
     x = sw - PIP_W - MARGIN                 # compute right-edge x
@@ -86,6 +88,8 @@ def main_loop(cap, window_name):
                 continue
 
             cv2.imshow(window_name, frame)  # show frame
+            monitor_server.drone.publish(frame)  # share with browser viewers, if any
+            visual_odometry.feed(frame)          # no-op unless the odometry fallback is running
             cv2.waitKey(1)                  # pump the window loop
             time.sleep(0.001)               # tiny pause to reduce CPU load
     finally:
@@ -32,7 +32,7 @@ recording = False     # Flag indicating whether click recording is active
 destination_list = [] # Final list of waypoints for the drone to follow
 
 # GUI objects (initialized later)
-root = tk.Tk()        # Create main Tkinter window
+root = None           # Main Tkinter window, created in initialize_gui() so importing gui stays cheap and headless
 canvas = None         # Placeholder for Canvas widget reference
 rec_btn = None        # Placeholder for record button reference
 scale_x = 1.0         # Scaling factor in X direction (screen/logical)
@@ -195,6 +195,8 @@ def initialize_screen_scaling():  # Calculate scaling factors
     return screen_width, screen_height  # Return dimensions
 
 def initialize_gui():  # Full GUI initialization
+    global root  # Assign to global variable
+    root = tk.Tk()  # Create main Tkinter window
     screen_width, screen_height = initialize_screen_scaling()  # Setup scaling
     configure_root_window(screen_width, screen_height)  # Window props
     create_canvas(screen_width, screen_height)  # Canvas setup
@@ -0,0 +1,120 @@
+# latency_budget.py
+"""
+Frame-latency budget controller for the vision loop.
+
+The ground station shares its CPU with the GUI, the drone feed and whatever
+else is running, so process_frame latency can double without warning. The
+controller keeps a rolling mean of per-frame latency and walks a ladder of
+quality levels, best first:
+
+  * when the mean over a full window exceeds the budget, it steps one level
+    down at once;
+  * when the mean has stayed below HEADROOM x budget for UP_HOLD seconds, it
+    steps one level back up.
+
+The window is cleared after every change, so each level is judged on its own
+frames only. Every change is recorded as a LevelChange event, passed to
+subscribers and counted in metrics().
+"""
+
+import time
+import threading
+from collections import deque, namedtuple
+
+WINDOW = 15       # frames in the rolling latency mean
+HEADROOM = 0.6    # step up only while the mean is below this fraction of the budget
+UP_HOLD = 5.0     # seconds of headroom required before stepping up
+EVENT_HISTORY = 20
+
+# One rung of the quality ladder:
+#   infer_size - model input size
+#   roi        - run the model only on a window around the predicted track position
+#   weights    - lighter weights to use, None for the main model
+#   cadence    - run detection every `cadence` frames
+#   tiled      - run the model on native-resolution tiles (roi: only around the predicted position)
+Level = namedtuple("Level", "name infer_size roi weights cadence tiled", defaults=(False,))
+
+# Immutable record of one level change
+LevelChange = namedtuple("LevelChange", "stamp old new name frame_ms budget_ms")
+
+
+class LatencyBudget:
+    """
+    Steps through `levels` to keep the rolling frame latency within budget.
+    """
+
+    def __init__(self, levels, budget_ms, window=WINDOW, headroom=HEADROOM, up_hold=UP_HOLD):
+        self.levels = list(levels)
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.up_hold = up_hold
+        self.index = 0                        # current level, 0 = best quality
+        self.samples = deque(maxlen=window)
+        self.events = deque(maxlen=EVENT_HISTORY)
+        self.changes = 0
+        self._since = time.monotonic()        # time of the last change (or of the last overload)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def subscribe(self, callback):
+        """
+        Call `callback(LevelChange)` on every level change.
+        """
+        self._listeners.append(callback)
+
+    def mean_ms(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def record(self, frame_ms, now=None):
+        """
+        Add one frame's latency and change level if needed.
+
+        Args:
+            frame_ms (float): Time spent on the frame
+            now (float or None): Defaults to time.monotonic()
+        Returns:
+            LevelChange or None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.samples.append(frame_ms)
+            if len(self.samples) < self.samples.maxlen:
+                return None
+            mean = self.mean_ms()
+            if mean > self.budget_ms:
+                if self.index == len(self.levels) - 1:
+                    return None  # already at the cheapest level
+                target = self.index + 1
+            elif mean < self.headroom * self.budget_ms:
+                if self.index == 0 or now - self._since < self.up_hold:
+                    return None
+                target = self.index - 1
+            else:
+                self._since = now  # in the band: headroom has to be sustained from here
+                return None
+            event = LevelChange(now, self.index, target, self.levels[target].name, round(mean, 2), self.budget_ms)
+            self.index = target
+            self.changes += 1
+            self.samples.clear()
+            self._since = now
+            self.events.append(event)
+        for callback in self._listeners:
+            callback(event)
+        return event
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Current level, rolling latency and change count
+        """
+        return {
+            "level": self.index,
+            "level_name": self.level.name,
+            "frame_ms": round(self.mean_ms(), 2),
+            "budget_ms": round(self.budget_ms, 2),
+            "level_changes": self.changes,
+        }
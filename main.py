@@ -1,18 +1,125 @@
 # main.py
 
-import threading, gui, udp_logic, yolo, drone_ap_connect
+import startup, threading # startup first: its import time is the reference for the timing report
+
+# Heavy modules (yolo/ultralytics, udp_logic, cv2) are imported inside the functions
+# that need them, so each thread pays for its own imports in parallel with the others.
+
+VISION_PROCESS = False # Run vision in its own process and share frames/positions through shared memory
+SWARM_MODE = False     # Fly every drone in swarm.SWARM at once instead of the single-drone mission
+MONITOR_SERVER = False # Serve the browser dashboard (monitor_server.py); only imported when on
 
 def ai_vision_tracking():
-    yolo.run() # Start the AI vision tracking
+    import yolo
+    startup.mark("vision imported")
+    yolo.run() # Start the AI vision tracking (model load overlaps camera start-up)
 
 def udp_command_loop():
-    drone_ap_connect.run() # Connect to drone AP before running the mission
+    if SWARM_MODE:
+        import swarm
+        swarm.run(vision_process=VISION_PROCESS) # Each drone's adapter is expected to be joined to its Tello already
+        return
+    import drone_ap_connect
+    connected = drone_ap_connect.run() # Connect to drone AP before running the mission
+    while not connected: # udp_logic cannot bind or reach the drone without the link, so keep trying
+        print(f"[MAIN] Tello not reachable after {drone_ap_connect.CONNECT_DEADLINE}s; retrying Wi-Fi connection...")
+        connected = drone_ap_connect.connect_to_tello() # SSID to restore was already saved by run()
+    startup.mark("wifi connected")
+    import udp_logic
     udp_logic.run() # Start UDP logic
 
+def position_pump(positions, stop_event, mode):
+    import yolo
+    seq = 0
+    while not stop_event.is_set():
+        update = positions.wait_newer(seq, timeout=0.1) # Woken by the vision process on every new fix
+        if update is None:
+            continue
+        seq, location, _, quality = update
+        if yolo.camera_mode is None and mode.value:
+            fourcc, width, height = mode.value.decode().split()
+            yolo.camera_mode = (fourcc, int(width), int(height)) # Keys the gain calibration in this process
+        yolo.track_quality = quality
+        yolo.drone_confirmed = quality >= yolo.MIN_TRACK_QUALITY # Writer sends 0 for unconfirmed tracks
+        if location is not None:
+            if yolo.drone_location is None:
+                startup.mark("first fix")
+                startup.report()
+            yolo.drone_location = location # Same global the mission thread already reads
+
+def display_loop(frames, stop_event):
+    import cv2, numpy as np, monitor_server
+    cv2.namedWindow("YOLO Inference", cv2.WINDOW_NORMAL)
+    cv2.setWindowProperty("YOLO Inference", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+    frame = np.empty(frames.shape, dtype=np.uint8) # Reused local copy: the writer can lap a shared slot while imshow reads it
+    shown = 0
+    while not stop_event.is_set():
+        if frames.seq() != shown:
+            seq = frames.read(frame) # Retries until the copy is consistent
+            if seq:
+                shown = seq
+                cv2.imshow("YOLO Inference", frame)
+                if monitor_server.external.wants_frames():
+                    monitor_server.external.publish(frame.copy()) # frame is reused; encoders get their own copy
+        cv2.waitKey(15) # Pump the window and pace the loop
+    cv2.destroyAllWindows()
+
+def start_vision_process():
+    import os, multiprocessing, yolo, vision_shm
+    tag = os.getpid()
+    frames = vision_shm.FrameBuffer.create(f"vm_frames_{tag}", yolo.OUT_H, yolo.OUT_W)
+    fix_event = multiprocessing.Event() # Set by the vision process on every position write
+    positions = vision_shm.PositionBuffer.create(f"vm_position_{tag}", event=fix_event)
+    stop_event = multiprocessing.Event()
+    mode = multiprocessing.Array("c", 64) # Camera mode the child negotiates
+    proc = multiprocessing.Process(
+        target=yolo.run_process, args=(frames.shm.name, positions.shm.name, stop_event, mode, fix_event),
+        name="vision", daemon=True
+    )
+    proc.start()
+    startup.mark("vision process started")
+    readers = [
+        threading.Thread(target=position_pump, args=(positions, stop_event, mode), daemon=True),
+        threading.Thread(target=display_loop, args=(frames, stop_event), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    return proc, readers, frames, positions, stop_event
+
+def stop_vision_process(proc, readers, frames, positions, stop_event):
+    stop_event.set() # Vision loop, pump and display all watch this
+    proc.join(timeout=5)
+    if proc.is_alive():
+        proc.terminate() # Camera read hung; don't block shutdown on it
+        proc.join()
+    for reader in readers:
+        reader.join(timeout=1) # Readers must drop their views before the blocks close
+    frames.close()
+    positions.close()
+    print("[MAIN] Vision process stopped.")
+
 if __name__ == "__main__":
 
-    threading.Thread(target=ai_vision_tracking, daemon=True).start() # Start the AI vision tracking
+    if MONITOR_SERVER:
+        import monitor_server
+        monitor_server.start() # Browser view of both streams and telemetry
+
+    vision = None
+    if VISION_PROCESS:
+        vision = start_vision_process() # Start the AI vision tracking in its own process
+    else:
+        threading.Thread(target=ai_vision_tracking, name="vision", daemon=True).start() # Start the AI vision tracking
+
+    threading.Thread(target=udp_command_loop, name="udp", daemon=True).start() # Start the UDP command loop
 
-    threading.Thread(target=udp_command_loop, daemon=True).start() # Start the UDP command loop
+    import gui
+    gui.initialize_gui() # Build the overlay while the model loads and Wi-Fi connects
+    startup.mark("gui ready")
 
-    gui.run() # Tkinter needs to run in main thread to function properly because of its event loop
\ No newline at end of file
+    try:
+        gui.root.mainloop() # Tkinter needs to run in main thread to function properly because of its event loop
+    finally:
+        if vision is not None:
+            stop_vision_process(*vision) # STOP exits the mainloop; release the process and shared memory
+        import visual_odometry
+        visual_odometry.stop() # No-op unless the odometry fallback was started
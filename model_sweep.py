@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Model speed/accuracy sweep.
+
+Measures CPU latency and throughput of candidate weights at several inference
+sizes on replayed frames, joins that with accuracy (a fresh validation pass
+when --data is given, otherwise the best epoch of the run's results.csv), and
+prints a Pareto table plus the WEIGHTS / INFER_SIZE / CONF_THR to use for a
+latency budget.
+
+    python model_sweep.py \\
+        --candidate train7/weights/best.pt=yolov11/runs/detect/train7 \\
+        --candidate train41/weights/best.pt=yolov11/runs/detect/train41 \\
+        --sizes 320 416 480 640 --frames flight.mp4 --budget-ms 40
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import statistics
+import cv2
+import numpy as np
+import yolo
+
+DEFAULT_SIZES = (320, 416, 480, 640)
+DEFAULT_FRAMES = 60     # frames replayed per (weights, size) pair
+WARMUP_FRAMES = 5
+MAP_COLUMN = "metrics/mAP50-95(B)"
+MAP50_COLUMN = "metrics/mAP50(B)"
+
+
+def load_frames(source, limit=DEFAULT_FRAMES):
+    """
+    Args:
+        source (str or None): Video file, image directory, or None for synthetic frames
+        limit (int): Maximum frames to load
+    Returns:
+        list: BGR frames
+    """
+    if source is None:
+        print("[SWEEP] No --frames given; timing on synthetic frames (latency only, no content).")
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 256, (yolo.PROC_H, yolo.PROC_W, 3), dtype=np.uint8) for _ in range(limit)]
+
+    if os.path.isdir(source):
+        names = sorted(n for n in os.listdir(source) if n.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")))
+        frames = [cv2.imread(os.path.join(source, n)) for n in names[:limit]]
+        return [f for f in frames if f is not None]
+
+    cap = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def find_run_dir(weights):
+    """
+    Returns:
+        str or None: Training run directory holding results.csv for these weights
+    """
+    here = os.path.dirname(os.path.abspath(weights))
+    for candidate in (here, os.path.dirname(here)):  # <run>/weights/best.pt or <run>/best.pt
+        if os.path.exists(os.path.join(candidate, "results.csv")):
+            return candidate
+    return None
+
+
+def read_run(run_dir):
+    """
+    Read the best epoch of a training run.
+
+    Returns:
+        dict: map50_95, map50, epoch and training imgsz/model from args.yaml
+    """
+    with open(os.path.join(run_dir, "results.csv")) as fh:
+        rows = [{k.strip(): v.strip() for k, v in row.items()} for row in csv.DictReader(fh)]
+    best = max(rows, key=lambda r: float(r[MAP_COLUMN]))
+    info = {"map50_95": float(best[MAP_COLUMN]), "map50": float(best[MAP50_COLUMN]), "epoch": int(best["epoch"])}
+
+    args_path = os.path.join(run_dir, "args.yaml")
+    if os.path.exists(args_path):
+        with open(args_path) as fh:
+            for line in fh:  # flat key: value file; avoids a YAML dependency
+                key, _, value = line.partition(":")
+                if key in ("imgsz", "model"):
+                    info[f"train_{key}"] = value.strip()
+    return info
+
+
+def time_model(model, frames, size):
+    """
+    Returns:
+        dict: median/p90 latency in ms and single-stream throughput in fps
+    """
+    for frame in frames[:WARMUP_FRAMES]:
+        model(frame, imgsz=size, device="cpu", verbose=False)
+    samples = []
+    start = time.perf_counter()
+    for frame in frames:
+        t0 = time.perf_counter()
+        model(frame, imgsz=size, device="cpu", verbose=False)
+        samples.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    samples.sort()
+    return {
+        "latency_ms": statistics.median(samples),
+        "p90_ms": samples[int(0.9 * (len(samples) - 1))],
+        "fps": len(frames) / total,
+    }
+
+
+def validate(model, data, size):
+    """
+    Fresh validation pass at this inference size.
+
+    Returns:
+        dict: map50_95, map50 and the confidence that maximises mean F1
+    """
+    metrics = model.val(data=data, imgsz=size, device="cpu", plots=False, verbose=False)
+    box = metrics.box
+    result = {"map50_95": float(box.map), "map50": float(box.map50)}
+    f1 = np.asarray(getattr(box, "f1_curve", []))
+    conf_axis = np.asarray(getattr(box, "px", []))
+    if f1.size and conf_axis.size:
+        result["best_conf"] = float(conf_axis[int(np.argmax(f1.mean(axis=0)))])
+    return result
+
+
+def pareto(rows):
+    """
+    Returns:
+        list: Rows not dominated on (lower latency, higher mAP50-95)
+    """
+    front = []
+    for r in rows:
+        dominated = any(
+            o["latency_ms"] <= r["latency_ms"] and o["map50_95"] >= r["map50_95"]
+            and (o["latency_ms"] < r["latency_ms"] or o["map50_95"] > r["map50_95"])
+            for o in rows
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: r["latency_ms"])
+
+
+def recommend(rows, budget_ms):
+    """
+    Returns:
+        dict or None: Most accurate row within the latency budget (fastest on ties)
+    """
+    fitting = [r for r in rows if r["latency_ms"] <= budget_ms]
+    if not fitting:
+        return None
+    return max(fitting, key=lambda r: (r["map50_95"], -r["latency_ms"]))
+
+
+def print_table(rows, front):
+    on_front = {id(r) for r in front}
+    print(f"\n{'weights':<40} {'size':>5} {'lat ms':>8} {'p90 ms':>8} {'fps':>7} {'mAP50':>7} {'mAP50-95':>9} {'acc src':>8}  pareto")
+    for r in sorted(rows, key=lambda r: r["latency_ms"]):
+        print(f"{r['weights'][-40:]:<40} {r['size']:>5} {r['latency_ms']:>8.1f} {r['p90_ms']:>8.1f} "
+              f"{r['fps']:>7.1f} {r['map50']:>7.3f} {r['map50_95']:>9.3f} {r['accuracy_source']:>8}  "
+              f"{'*' if id(r) in on_front else ''}")
+
+
+def parse_candidate(spec):
+    """
+    Args:
+        spec (str): 'weights' or 'weights=run_dir'
+    Returns:
+        (weights path, run dir or None)
+    """
+    weights, _, run_dir = spec.partition("=")
+    return weights, (run_dir or find_run_dir(weights))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidate", action="append", required=True,
+                        help="weights[=run_dir]; run_dir holds results.csv (repeatable)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="inference sizes to try")
+    parser.add_argument("--frames", help="video file or image directory to replay")
+    parser.add_argument("--limit", type=int, default=DEFAULT_FRAMES, help="frames replayed per measurement")
+    parser.add_argument("--data", help="dataset YAML for a fresh validation pass at every size")
+    parser.add_argument("--budget-ms", type=float, default=33.0, help="per-frame latency budget")
+    parser.add_argument("--threads", type=int, help="torch CPU threads (default: torch's choice)")
+    parser.add_argument("--out", help="write all rows as JSON here")
+    args = parser.parse_args(argv)
+
+    from ultralytics import YOLO  # heavy import, only once arguments are valid
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    frames = load_frames(args.frames, args.limit)
+    if not frames:
+        print("[SWEEP] No frames could be loaded.")
+        return 1
+
+    rows = []
+    for spec in args.candidate:
+        weights, run_dir = parse_candidate(spec)
+        run = read_run(run_dir) if run_dir else None
+        model = YOLO(weights, task="detect")
+        for size in args.sizes:
+            print(f"[SWEEP] {weights} @ {size}...")
+            row = {"weights": weights, "size": size, **time_model(model, frames, size)}
+            if args.data:
+                row.update(validate(model, args.data, size))
+                row["accuracy_source"] = "val"
+            elif run:
+                row["map50_95"], row["map50"] = run["map50_95"], run["map50"]
+                # results.csv only covers the training size; other sizes reuse it as an upper bound
+                same = str(size) == run.get("train_imgsz")
+                row["accuracy_source"] = "csv" if same else "csv~"
+            else:
+                print(f"[SWEEP] No accuracy for {weights}: give --data or weights=run_dir.")
+                continue
+            rows.append(row)
+
+    if not rows:
+        return 1
+    # csv~ rows carry the training-size mAP, so they cannot be ranked against each other
+    ranked = [r for r in rows if r["accuracy_source"] != "csv~"]
+    front = pareto(ranked)
+    print_table(rows, front)
+    print("\nacc src: val = fresh validation, csv = run results.csv, "
+          "csv~ = results.csv at a different size (not ranked; give --data)")
+
+    best = recommend(ranked, args.budget_ms)
+    if best is None:
+        fastest = min(ranked or rows, key=lambda r: r["latency_ms"])
+        print(f"\nNothing fits {args.budget_ms:.0f} ms; fastest is {fastest['weights']} @ {fastest['size']} "
+              f"({fastest['latency_ms']:.1f} ms).")
+    else:
+        print(f"\nRecommended for a {args.budget_ms:.0f} ms budget (yolo.py):")
+        print(f'    WEIGHTS    = "{best["weights"]}"')
+        print(f"    INFER_SIZE = {best['size']}")
+        print(f"    CONF_THR   = {best.get('best_conf', yolo.CONF_THR):.2f}"
+              + ("" if "best_conf" in best else "  # unchanged; give --data to pick it from the F1 curve"))
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump({"budget_ms": args.budget_ms, "rows": rows, "recommended": best}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# monitor_server.py
+"""
+Local live-monitoring server.
+
+Serves the annotated external-camera view and the Tello feed as MJPEG, and
+telemetry/mission state as Server-Sent Events, to any browser on localhost
+(or the LAN when HOST is "0.0.0.0"):
+
+    /                  simple dashboard
+    /external.mjpg     annotated vision stream   (?tier=low for the reduced tier)
+    /drone.mjpg        Tello camera stream
+    /events            telemetry, one JSON object per event
+
+Producers only hand over a frame reference; nothing is encoded while nobody is
+watching. Each frame is JPEG-encoded at most once per rate tier, in that
+tier's encoder thread, and the bytes are shared by all its viewers. Viewers
+always take the newest encoded frame, so a slow client skips frames instead
+of holding up the encoder or the vision loop.
+"""
+
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+HOST = "127.0.0.1"       # "0.0.0.0" to serve the LAN
+PORT = 8080
+TELEMETRY_INTERVAL = 0.2 # seconds between SSE telemetry events
+BOUNDARY = "frame"
+
+# Rate tiers: output scale, JPEG quality and max frame rate
+TIERS = {
+    "full": {"scale": 1.0, "quality": 80, "fps": 30},
+    "low": {"scale": 0.5, "quality": 60, "fps": 10},
+}
+
+
+class StreamHub:
+    """
+    Latest-frame store for one video source with per-tier shared encoders.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._frame = None
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._viewers = {tier: 0 for tier in TIERS}
+        self._encoded = {tier: (0, None) for tier in TIERS}  # tier -> (source seq, jpeg bytes)
+        self._encoders = {}
+
+    def wants_frames(self):
+        """
+        Returns:
+            bool: True if any viewer is connected (producers may skip work otherwise)
+        """
+        return any(self._viewers.values())
+
+    def publish(self, frame):
+        """
+        Hand over the newest frame. Never blocks on viewers.
+
+        The frame must not be modified afterwards; pass a copy if the producer
+        reuses its buffer.
+        """
+        if not self.wants_frames():
+            return
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._cond.notify_all()
+
+    def _encode_loop(self, tier):
+        import cv2  # here, not at module level: main imports this module before any thread starts
+        settings = TIERS[tier]
+        interval = 1.0 / settings["fps"]
+        last_seq = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._seq != last_seq or not self._viewers[tier], timeout=1.0)
+                if not self._viewers[tier]:
+                    self._encoders.pop(tier, None)  # under the lock, so subscribe() sees a consistent state
+                    return
+                frame, seq = self._frame, self._seq
+            if frame is None or seq == last_seq:
+                continue
+            started = time.monotonic()
+            if settings["scale"] != 1.0:
+                frame = cv2.resize(frame, None, fx=settings["scale"], fy=settings["scale"],
+                                   interpolation=cv2.INTER_AREA)
+            ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, settings["quality"]])
+            if ok:
+                with self._cond:
+                    self._encoded[tier] = (seq, jpeg.tobytes())
+                    self._cond.notify_all()
+            last_seq = seq
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))  # rate cap for this tier
+
+    def subscribe(self, tier):
+        with self._cond:
+            self._viewers[tier] += 1
+            if tier not in self._encoders:
+                encoder = threading.Thread(target=self._encode_loop, args=(tier,),
+                                           name=f"encode-{self.name}-{tier}", daemon=True)
+                self._encoders[tier] = encoder
+                encoder.start()
+
+    def unsubscribe(self, tier):
+        with self._cond:
+            self._viewers[tier] -= 1
+            self._cond.notify_all()
+
+    def next_jpeg(self, tier, last_seq, timeout=5.0):
+        """
+        Wait for an encoded frame newer than last_seq.
+
+        Returns:
+            (seq, jpeg bytes) or (last_seq, None) on timeout
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._encoded[tier][0] > last_seq, timeout=timeout)
+            seq, jpeg = self._encoded[tier]
+        return (seq, jpeg) if seq > last_seq else (last_seq, None)
+
+
+external = StreamHub("external")  # annotated vision frames (yolo)
+drone = StreamHub("drone")        # Tello camera frames (drone_feed)
+HUBS = {"/external.mjpg": external, "/drone.mjpg": drone}
+
+_server = None
+
+
+def telemetry():
+    """
+    Returns:
+        dict: Snapshot of vision and mission state
+    """
+    import yolo, udp_logic  # imported here: both are already loaded when the app is running
+    track = yolo.drone_track
+    return {
+        "time": time.time(),
+        "drone_location": yolo.drone_location,
+        "track_id": track.id if track else None,
+        "track_quality": round(yolo.track_quality, 3),
+        "confirmed": yolo.drone_confirmed,
+        "vision_quality": yolo.quality.metrics(),
+        "quality_events": [e._asdict() for e in yolo.quality.events],
+        "mission_state": udp_logic.MISSION_STATE,
+        "waypoint": udp_logic.CURRENT_WAYPOINT,
+        "waypoints": [list(p) for p in udp_logic.gui.destination_list],
+    }
+
+
+INDEX_HTML = """<!doctype html>
+<html><head><title>Vision Mission</title>
+<style>body{font-family:sans-serif;background:#111;color:#eee} img{max-width:49%%} pre{font-size:14px}</style>
+</head><body>
+<h3>Vision Mission monitor</h3>
+<img src="/external.mjpg?tier=%(tier)s"> <img src="/drone.mjpg?tier=%(tier)s">
+<pre id="t">waiting for telemetry...</pre>
+<script>
+new EventSource("/events").onmessage = e => {
+  document.getElementById("t").textContent = JSON.stringify(JSON.parse(e.data), null, 2);
+};
+</script>
+</body></html>
+"""
+
+
+class MonitorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"  # streams end when the connection closes
+
+    def log_message(self, fmt, *args):
+        pass  # keep the console for mission logs
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        tier = parse_qs(url.query).get("tier", ["full"])[0]
+        if tier not in TIERS:
+            tier = "full"
+        if url.path == "/":
+            body = (INDEX_HTML % {"tier": tier}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif url.path in HUBS:
+            self.stream_mjpeg(HUBS[url.path], tier)
+        elif url.path == "/events":
+            self.stream_events()
+        else:
+            self.send_error(404)
+
+    def stream_mjpeg(self, hub, tier):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        hub.subscribe(tier)
+        seq = 0
+        try:
+            while True:
+                seq, jpeg = hub.next_jpeg(tier, seq)  # newest frame; older ones are skipped
+                if jpeg is None:
+                    continue
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # viewer went away
+        finally:
+            hub.unsubscribe(tier)
+
+    def stream_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                self.wfile.write(f"data: {json.dumps(telemetry())}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(TELEMETRY_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start(host=HOST, port=PORT):
+    """
+    Start the server in a daemon thread.
+
+    Returns:
+        ThreadingHTTPServer
+    """
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), MonitorHandler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="monitor", daemon=True).start()
+        print(f"[MONITOR] Serving on http://{host}:{_server.server_address[1]}/")
+    return _server
+
+
+def stop():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
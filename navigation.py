@@ -1,5 +1,7 @@
 # navigation.py
 
+import numpy as np
+
 def make_scale_converter(pixel_ref, real_cm_ref):
     """
     Create a converter that maps pixel coordinates to centimeters based on a calibration reference.
@@ -76,7 +78,9 @@ def calculate_udp(forward, sideways):
 
 
 # Pre-calibrated converter using default reference values (1920 px = 300 cm)
-coord_to_cm = make_scale_converter(pixel_ref=1920, real_cm_ref=300)
+PIXEL_REF = 1920
+REAL_CM_REF = 300
+coord_to_cm = make_scale_converter(pixel_ref=PIXEL_REF, real_cm_ref=REAL_CM_REF)
 
 
 def calculate_from_pixels(start_px, end_px):
@@ -103,3 +107,41 @@ def calculate_from_pixels(start_px, end_px):
     new_sideways = -forward
 
     return calculate_udp(round(new_forward), round(new_sideways))
+
+
+def moves_from_pixels_batch(starts_px, ends_px):
+    """
+    Vectorised form of calculate_from_pixels for many start/end pairs.
+
+    Applies the same default calibration, 90° rotation and rounding, but on
+    whole arrays at once instead of one pair per call.
+
+    Args:
+        starts_px: Array-like of shape (N, 2) with start positions in pixels.
+        ends_px: Array-like of shape (N, 2) with end positions in pixels.
+
+    Returns:
+        (forward, sideways): Integer arrays of shape (N,) in centimeters.
+    """
+    delta_cm = (np.asarray(ends_px, dtype=np.float64) - np.asarray(starts_px, dtype=np.float64)) \
+        * (REAL_CM_REF / PIXEL_REF)
+
+    forward = np.rint(delta_cm[:, 0]).astype(int)    # original 'right' becomes forward
+    sideways = np.rint(-delta_cm[:, 1]).astype(int)  # original 'forward' becomes left
+
+    return forward, sideways
+
+
+def calculate_from_pixels_batch(starts_px, ends_px):
+    """
+    Batch helper: UDP command strings for many start/end pairs.
+
+    Args:
+        starts_px: Array-like of shape (N, 2) with start positions in pixels.
+        ends_px: Array-like of shape (N, 2) with end positions in pixels.
+
+    Returns:
+        list of (forward_cmd, sideways_cmd)
+    """
+    forward, sideways = moves_from_pixels_batch(starts_px, ends_px)
+    return [calculate_udp(int(f), int(s)) for f, s in zip(forward, sideways)]
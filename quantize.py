@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+INT8 quantization pipeline with an accuracy gate.
+
+Exports the FP32 detector to ONNX, applies post-training static INT8
+quantization (onnxruntime) calibrated on images from the training data or
+from recorded flights, then compares the INT8 model against FP32:
+
+  * mAP50-95 on the validation set (when --data is given), and
+  * detection-centre error on held-out images: the pixel distance between the
+    drone centres both models report, plus how often only one of them finds it.
+
+The INT8 model is only published (copied to --publish, with a JSON report
+beside it) when every drop is within its threshold. yolo.py loads the
+published .onnx directly: set WEIGHTS to it and keep INFER_SIZE equal to
+--imgsz, since the export has a fixed input size.
+
+    python quantize.py --weights best.pt --calib datasets/drone/images/train \\
+        --calib flights/2024-05-02.mp4 --data data.yaml --publish best_int8.onnx
+"""
+
+import os
+import sys
+import json
+import shutil
+import random
+import argparse
+import cv2
+import numpy as np
+import yolo
+
+CALIB_IMAGES = 200        # images fed through the model to collect activation ranges
+EVAL_IMAGES = 100         # held-out images for the centre-error check
+MAX_MAP_DROP = 0.02       # allowed absolute mAP50-95 drop vs FP32
+MAX_CENTER_ERR_PX = 4.0   # allowed mean centre error, in frame pixels
+MAX_DISAGREEMENT = 0.05   # allowed fraction of images where only one model finds the drone
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def collect_images(sources, limit, seed=0):
+    """
+    Sample frames from image directories and/or flight recordings.
+
+    Args:
+        sources (list): Directories of images or video files
+        limit (int): Total frames to return
+    Returns:
+        list: BGR frames
+    """
+    paths, videos = [], []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                paths += [os.path.join(root, n) for n in names if n.lower().endswith(IMAGE_EXTS)]
+        else:
+            videos.append(source)
+
+    frames = []
+    for video in videos:
+        cap = cv2.VideoCapture(video)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or limit
+        step = max(1, total // max(1, limit // max(1, len(videos))))  # spread samples over the flight
+        index = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if index % step == 0:
+                frames.append(frame)
+            index += 1
+        cap.release()
+
+    random.Random(seed).shuffle(paths)
+    for path in paths:
+        if len(frames) >= limit:
+            break
+        image = cv2.imread(path)
+        if image is not None:
+            frames.append(image)
+    random.Random(seed).shuffle(frames)
+    return frames[:limit]
+
+
+def letterbox(image, size):
+    """
+    Resize keeping aspect ratio and pad to size x size, as Ultralytics does.
+
+    Returns:
+        ndarray: 1x3xSxS float32 tensor in [0, 1], RGB
+    """
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    nh, nw = int(round(h * scale)), int(round(w * scale))
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top, left = (size - nh) // 2, (size - nw) // 2
+    canvas[top:top + nh, left:left + nw] = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    tensor = canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+    return np.ascontiguousarray(tensor)
+
+
+def export_fp32(weights, size):
+    """
+    Returns:
+        str: Path of the FP32 ONNX export
+    """
+    from ultralytics import YOLO
+    return YOLO(weights).export(format="onnx", imgsz=size, dynamic=False, simplify=True)
+
+
+def quantize_int8(fp32_path, int8_path, frames, size, method="minmax", exclude=()):
+    """
+    Post-training static INT8 quantization (QDQ, per-channel weights).
+    """
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static
+    )
+    import onnxruntime as ort
+
+    input_name = ort.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._frames = iter(frames)
+
+        def get_next(self):
+            frame = next(self._frames, None)
+            return None if frame is None else {input_name: letterbox(frame, size)}
+
+    quantize_static(
+        fp32_path, int8_path, FrameReader(),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method={"minmax": CalibrationMethod.MinMax,
+                          "percentile": CalibrationMethod.Percentile,
+                          "entropy": CalibrationMethod.Entropy}[method],
+        nodes_to_exclude=list(exclude),  # e.g. the detection-head nodes if they quantize badly
+    )
+
+
+def drone_center(model, frame, size):
+    """
+    Returns:
+        (cx, cy) or None: Centre of the most confident drone box, in frame pixels
+    """
+    boxes = model(frame, imgsz=size, conf=yolo.CONF_THR, verbose=False)[0].boxes
+    best = None
+    for box in boxes:
+        if int(box.cls[0]) == 0 and (best is None or float(box.conf[0]) > float(best.conf[0])):
+            best = box
+    if best is None:
+        return None
+    x1, y1, x2, y2 = best.xyxy[0].cpu().numpy()
+    return (x1 + x2) / 2, (y1 + y2) / 2
+
+
+def center_error(reference, candidate, frames, size):
+    """
+    Returns:
+        dict: mean/max centre error over frames both models detect, and the disagreement rate
+    """
+    errors, disagree = [], 0
+    for frame in frames:
+        a, b = drone_center(reference, frame, size), drone_center(candidate, frame, size)
+        if (a is None) != (b is None):
+            disagree += 1
+        elif a is not None:
+            errors.append(float(np.hypot(a[0] - b[0], a[1] - b[1])))
+    return {
+        "mean_center_err_px": float(np.mean(errors)) if errors else 0.0,
+        "max_center_err_px": float(np.max(errors)) if errors else 0.0,
+        "disagreement": disagree / max(1, len(frames)),
+        "frames": len(frames),
+    }
+
+
+def gate(report, max_map_drop, max_center_err, max_disagreement):
+    """
+    Returns:
+        list: Reasons the INT8 model fails the gate (empty when it passes)
+    """
+    failures = []
+    if "map_drop" in report and report["map_drop"] > max_map_drop:
+        failures.append(f"mAP50-95 drop {report['map_drop']:.4f} > {max_map_drop}")
+    if report["mean_center_err_px"] > max_center_err:
+        failures.append(f"mean centre error {report['mean_center_err_px']:.2f}px > {max_center_err}px")
+    if report["disagreement"] > max_disagreement:
+        failures.append(f"detection disagreement {report['disagreement']:.1%} > {max_disagreement:.0%}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", default=yolo.WEIGHTS, help="FP32 weights (.pt)")
+    parser.add_argument("--imgsz", type=int, default=yolo.INFER_SIZE, help="export/inference size")
+    parser.add_argument("--calib", action="append", required=True,
+                        help="image directory or flight video for calibration and evaluation (repeatable)")
+    parser.add_argument("--calib-count", type=int, default=CALIB_IMAGES)
+    parser.add_argument("--eval-count", type=int, default=EVAL_IMAGES)
+    parser.add_argument("--method", choices=("minmax", "percentile", "entropy"), default="minmax")
+    parser.add_argument("--exclude", nargs="*", default=(), help="ONNX node names to keep in FP32")
+    parser.add_argument("--data", help="dataset YAML for the mAP comparison")
+    parser.add_argument("--max-map-drop", type=float, default=MAX_MAP_DROP)
+    parser.add_argument("--max-center-err", type=float, default=MAX_CENTER_ERR_PX)
+    parser.add_argument("--max-disagreement", type=float, default=MAX_DISAGREEMENT)
+    parser.add_argument("--publish", default="best_int8.onnx", help="where the gated INT8 model is copied")
+    args = parser.parse_args(argv)
+
+    from ultralytics import YOLO
+
+    frames = collect_images(args.calib, args.calib_count + args.eval_count)
+    calib, held_out = frames[:args.calib_count], frames[args.calib_count:]
+    if not calib or not held_out:
+        print(f"[QUANT] Need calibration and held-out frames; got {len(calib)} and {len(held_out)}.")
+        return 1
+    print(f"[QUANT] {len(calib)} calibration / {len(held_out)} held-out frames")
+
+    fp32_path = export_fp32(args.weights, args.imgsz)
+    int8_path = os.path.splitext(fp32_path)[0] + "_int8.onnx"
+    print(f"[QUANT] Quantizing {fp32_path} -> {int8_path} ({args.method})")
+    quantize_int8(fp32_path, int8_path, calib, args.imgsz, args.method, args.exclude)
+
+    reference = YOLO(args.weights)
+    candidate = YOLO(int8_path, task="detect")
+    report = {"weights": args.weights, "int8": int8_path, "imgsz": args.imgsz, "method": args.method}
+    report.update(center_error(reference, candidate, held_out, args.imgsz))
+
+    if args.data:
+        fp32_map = float(reference.val(data=args.data, imgsz=args.imgsz, device="cpu", plots=False).box.map)
+        int8_map = float(candidate.val(data=args.data, imgsz=args.imgsz, device="cpu", plots=False).box.map)
+        report.update(fp32_map50_95=fp32_map, int8_map50_95=int8_map, map_drop=fp32_map - int8_map)
+    else:
+        print("[QUANT] No --data; gating on centre error and disagreement only.")
+
+    failures = gate(report, args.max_map_drop, args.max_center_err, args.max_disagreement)
+    report["passed"] = not failures
+    report["failures"] = failures
+    print(json.dumps(report, indent=2))
+
+    if failures:
+        print("[QUANT] Accuracy gate FAILED; not publishing:")
+        for reason in failures:
+            print(f"[QUANT]   {reason}")
+        return 2
+
+    shutil.copyfile(int8_path, args.publish)
+    with open(os.path.splitext(args.publish)[0] + ".json", "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"[QUANT] Published {args.publish}; set yolo.WEIGHTS to it (INFER_SIZE = {args.imgsz}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# startup.py
+"""
+Startup timing marks.
+
+Each process records named milestones relative to the moment this module was
+first imported (main.py imports it before anything else), and prints a short
+report once the first vision fix arrives.
+"""
+
+import time
+import threading
+
+T0 = time.perf_counter()  # reference point for all marks in this process
+
+_marks = []               # (label, seconds since T0, thread name)
+_lock = threading.Lock()  # marks arrive from several threads
+_reported = False
+
+
+def mark(label):
+    """
+    Record a startup milestone.
+
+    Args:
+        label (str): Short name of the milestone
+    Returns:
+        float: Seconds since T0
+    """
+    elapsed = time.perf_counter() - T0
+    with _lock:
+        _marks.append((label, elapsed, threading.current_thread().name))
+    return elapsed
+
+
+def report():
+    """
+    Print all milestones once, in the order they happened.
+    """
+    global _reported
+    with _lock:
+        if _reported:
+            return
+        _reported = True
+        marks = sorted(_marks, key=lambda m: m[1])
+    print("[STARTUP] Timing report:")
+    for label, elapsed, thread in marks:
+        print(f"[STARTUP]   {elapsed:7.3f}s  {label:<24} ({thread})")
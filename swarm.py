@@ -0,0 +1,338 @@
+# swarm.py
+"""
+Multi-drone swarm mode.
+
+Several Tellos are tracked by the external camera at once (yolo.drone_tracks
+holds the confirmed tracks),
+each is tied to a vision track ID, gets its own command channel, and flies its
+own waypoint list in its own thread. A shared scheduler only lets a drone start
+a move when the straight segment it is about to fly stays MIN_SEPARATION away
+from every other drone's predicted position or in-flight move.
+"""
+
+import time
+import threading
+import navigation as NAV
+import udp_sender as UDP
+import udp_logic
+import yolo
+import gui
+
+# One entry per drone. Each Tello is its own AP, so each needs its own Wi-Fi
+# adapter already joined to it; local_ip/device pick that adapter.
+SWARM = [
+    {"name": "alpha", "local_ip": "192.168.10.2", "local_port": 9000, "device": None, "start": (480, 540)},
+    {"name": "bravo", "local_ip": "192.168.10.3", "local_port": 9001, "device": None, "start": (1440, 540)},
+]
+
+MIN_SEPARATION = 300   # output pixels that must stay between any two drones
+PREDICT_HORIZON = 1.0  # seconds ahead to extrapolate drones that are not moving under our control
+LOST_SPEED = 150       # output px/s a drone without a live track may have drifted since it was last seen
+WAIT_STEP = 0.2        # seconds between separation re-checks while a move is blocked
+MOVE_TIMEOUT = 30      # seconds a move may stay blocked before the drone hovers and skips it
+HANDSHAKE_CM = 30      # size of the forward/back wiggle used to identify a drone
+HANDSHAKE_MIN_PX = 60  # minimum track displacement that counts as the wiggle
+
+
+class SwarmDrone:
+    """
+    One drone: its command channel, vision track and progress.
+    """
+
+    def __init__(self, name, local_ip, local_port, device=None, start=None):
+        self.name = name
+        self.channel = UDP.TelloChannel(local_ip, local_port, device=device)
+        self.start = start      # expected initial position, for association
+        self.track_id = None    # vision track this drone is bound to
+        self.airborne = False
+        self.attempts = {}      # waypoint -> attempts used
+
+    def location(self):
+        """
+        Returns:
+            (x, y) or None: Latest tracked position of this drone
+        """
+        track = yolo.drone_tracks.get(self.track_id)
+        return None if track is None else (int(track.x), int(track.y))
+
+    def send(self, cmd):
+        return self.channel.send_command(cmd)
+
+    def takeoff(self):
+        if not self.airborne:
+            self.send('takeoff')
+            self.airborne = True
+
+    def land(self):
+        if self.airborne:
+            self.send('land')
+            self.airborne = False
+
+
+def distance(a, b):
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+def point_segment_distance(p, a, b):
+    """
+    Returns:
+        float: Shortest distance from point p to segment a-b
+    """
+    ax, ay = a
+    dx, dy = b[0] - ax, b[1] - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return distance(p, a)
+    t = max(0.0, min(1.0, ((p[0] - ax) * dx + (p[1] - ay) * dy) / length_sq))
+    return distance(p, (ax + t * dx, ay + t * dy))
+
+def segments_intersect(a, b, c, d):
+    def orient(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    return (orient(a, b, c) * orient(a, b, d) < 0) and (orient(c, d, a) * orient(c, d, b) < 0)
+
+def segment_distance(a, b, c, d):
+    """
+    Returns:
+        float: Shortest distance between segments a-b and c-d
+    """
+    if segments_intersect(a, b, c, d):
+        return 0.0
+    return min(point_segment_distance(a, c, d), point_segment_distance(b, c, d),
+               point_segment_distance(c, a, b), point_segment_distance(d, a, b))
+
+
+class SwarmScheduler:
+    """
+    Grants moves only when they keep every pair of drones MIN_SEPARATION apart.
+    """
+
+    def __init__(self, drones, min_separation=MIN_SEPARATION):
+        self.drones = drones
+        self.min_separation = min_separation
+        self._reserved = {}  # drone name -> (start, end) segment being flown
+        self._last_seen = {}  # drone name -> (a, b, stamp): where it was last known to be
+        self._lock = threading.Lock()
+
+    def predicted_path(self, drone, now):
+        """
+        Returns:
+            (a, b, radius) or None: Segment the drone may occupy soon and how far
+                    off it the drone may be: its reserved move, its tracked
+                    position extrapolated over PREDICT_HORIZON, or, while its
+                    track is lost (occluded, or merged with a close neighbour),
+                    its last known position with a radius growing at LOST_SPEED.
+                    None if its position was never known.
+        """
+        if drone.name in self._reserved:
+            return self._reserved[drone.name] + (0.0,)
+        track = yolo.drone_tracks.get(drone.track_id)
+        if track is not None:
+            dt = now - track.stamp
+            here = (track.x + track.vx * dt, track.y + track.vy * dt)
+            ahead = (here[0] + track.vx * PREDICT_HORIZON, here[1] + track.vy * PREDICT_HORIZON)
+            self._last_seen[drone.name] = (here, here, track.stamp)
+            return here, ahead, 0.0
+        if drone.name not in self._last_seen:
+            return None
+        a, b, stamp = self._last_seen[drone.name]
+        return a, b, LOST_SPEED * (now - stamp)
+
+    def request(self, drone, start, end):
+        """
+        Reserve the segment start-end for `drone` if it is clear of all others.
+
+        Returns:
+            bool: True if the move was granted
+        """
+        now = time.monotonic()
+        with self._lock:
+            for other in self.drones:
+                if other is drone:
+                    continue
+                path = self.predicted_path(other, now)
+                if path is None:
+                    if other.airborne:
+                        return False  # flying somewhere unknown: no move is known to be clear of it
+                    continue
+                a, b, radius = path
+                if segment_distance(start, end, a, b) < self.min_separation + radius:
+                    return False
+            self._reserved[drone.name] = (start, end)
+            return True
+
+    def release(self, drone):
+        with self._lock:
+            segment = self._reserved.pop(drone.name, None)
+            if segment is not None:
+                self._last_seen[drone.name] = segment + (time.monotonic(),)  # somewhere along the move just flown
+
+    def wait_for_clearance(self, drone, start, end, timeout=MOVE_TIMEOUT):
+        """
+        Returns:
+            bool: True once the move is granted, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while not self.request(drone, start, end):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(WAIT_STEP)
+        return True
+
+
+def associate_by_start(drones, tracks):
+    """
+    Bind each drone to the unclaimed track nearest its configured start position.
+
+    Returns:
+        list: Drones that could not be associated
+    """
+    free = dict(tracks)
+    pending = []
+    for drone in drones:
+        if drone.start is None or not free:
+            pending.append(drone)
+            continue
+        best = min(free.values(), key=lambda t: distance((t.x, t.y), drone.start))
+        if distance((best.x, best.y), drone.start) > MIN_SEPARATION:
+            pending.append(drone)  # nothing close to where this drone should be
+            continue
+        drone.track_id = best.id
+        del free[best.id]
+        print(f"[SWARM] {drone.name} -> track {best.id} at ({int(best.x)},{int(best.y)})")
+    return pending
+
+def associate_by_handshake(drones, claimed):
+    """
+    Identify airborne drones by making each wiggle forward and back and
+    watching which unclaimed track moved.
+
+    Args:
+        drones (list): Drones still without a track
+        claimed (set): Track IDs already bound to other drones
+    """
+    for drone in drones:
+        before = {tid: (t.x, t.y) for tid, t in yolo.drone_tracks.items() if tid not in claimed}
+        drone.send(f"forward {HANDSHAKE_CM}")
+        time.sleep(udp_logic.DELAY)
+        moved = {
+            tid: distance((t.x, t.y), before[tid])
+            for tid, t in yolo.drone_tracks.items() if tid in before
+        }
+        drone.send(f"back {HANDSHAKE_CM}")
+        if moved and max(moved.values()) >= HANDSHAKE_MIN_PX:
+            drone.track_id = max(moved, key=moved.get)
+            claimed.add(drone.track_id)
+            print(f"[SWARM] {drone.name} -> track {drone.track_id} (handshake)")
+        else:
+            print(f"[SWARM] {drone.name}: no track responded to the handshake")
+
+def move_drone(drone, scheduler, dest):
+    """
+    One attempt to reach dest: forward leg along x, then sideways leg along y,
+    each granted by the scheduler before it is flown.
+
+    Returns:
+        bool: True if the drone ended within tolerance of dest
+    """
+    loc = drone.location()
+    if loc is None:
+        print(f"[SWARM] {drone.name}: no vision data; skipping move.")
+        return False
+
+    legs = (
+        (0, (dest[0], loc[1])),  # forward/back moves the drone along image x
+        (1, dest),               # left/right moves it along image y
+    )
+    for index, target in legs:
+        loc = drone.location() or loc
+        cmd = NAV.calculate_from_pixels(loc, target)[index]
+        if not scheduler.wait_for_clearance(drone, loc, target):
+            print(f"[SWARM] {drone.name}: blocked moving to {target}; hovering.")
+            return False
+        try:
+            udp_logic.send_command_if_needed(cmd, send=drone.send)
+        finally:
+            scheduler.release(drone)
+
+    return udp_logic.is_close_enough(drone.location(), dest, x_tol=128, y_tol=72)
+
+def fly(drone, scheduler, waypoints, max_retries=3):
+    """
+    Take off, visit every waypoint with retries, and land.
+    """
+    drone.takeoff()
+    for dest in waypoints:
+        for attempt in range(1, max_retries + 1):
+            drone.attempts[dest] = attempt
+            if move_drone(drone, scheduler, dest):
+                print(f"[SWARM] {drone.name}: reached {dest} in {attempt} attempt(s).")
+                break
+        else:
+            print(f"[SWARM] {drone.name}: failed to reach {dest} after {max_retries} attempts.")
+    drone.land()
+
+def build_drones(config=SWARM):
+    return [SwarmDrone(**entry) for entry in config]
+
+def fly_missions(drones, missions):
+    """
+    Fly several waypoint lists at once, one thread per drone.
+
+    Args:
+        drones (list): Connected and associated SwarmDrone objects
+        missions (dict): Drone name -> list of (x, y) waypoints
+    """
+    scheduler = SwarmScheduler(drones)
+    threads = [
+        threading.Thread(target=fly, args=(d, scheduler, missions.get(d.name, [])),
+                         name=f"swarm-{d.name}", daemon=True)
+        for d in drones if d.track_id is not None
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+def run(config=SWARM, vision_process=False):
+    """
+    Swarm entry point: connect every drone, associate tracks, then fly the GUI
+    route with each drone starting from a different waypoint.
+
+    Args:
+        config (list): Drone entries, see SWARM
+        vision_process (bool): Vision runs in another process, so
+            yolo.drone_tracks stays empty here and swarm mode cannot run
+    """
+    if vision_process:
+        print("[SWARM] Swarm mode needs per-drone tracks, which only exist in the vision process; "
+              "set VISION_PROCESS = False. Not flying.")
+        return
+    print("[SWARM] Swarm logic thread running...")
+    drones = build_drones(config)
+    for drone in drones:
+        drone.channel.connect()
+        drone.send('command')
+
+    while True:
+        udp_logic.wait_for_mission()
+        route = list(gui.destination_list)
+
+        pending = associate_by_start(drones, yolo.drone_tracks)
+        claimed = {d.track_id for d in drones if d.track_id is not None}
+        if pending and not set(yolo.drone_tracks) - claimed:
+            print(f"[SWARM] No unclaimed tracks for {[d.name for d in pending]}; leaving them on the ground.")
+        elif pending:
+            for drone in pending:
+                drone.takeoff()  # handshake needs the drones in the air
+            associate_by_handshake(pending, claimed)
+            for drone in pending:
+                if drone.track_id is None:
+                    drone.land()  # an unidentified drone in the air would block every move
+
+        missions = {d.name: route[i % len(route):] + route[:i % len(route)] for i, d in enumerate(drones)}
+        fly_missions(drones, missions)
+        for drone in drones:
+            drone.land()  # drones that were never associated are still hovering
+            print(f"[SWARM] {drone.name} attempts per waypoint: {drone.attempts}")
+            drone.track_id = None  # re-associate on the next mission
+        gui.destination_list.clear()
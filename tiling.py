@@ -0,0 +1,76 @@
+# tiling.py
+"""
+Tile layout and cross-tile merging for tiled inference.
+
+A distant Tello is only a few dozen pixels wide in a 1080p frame and vanishes
+when the whole frame is letterboxed down to the model size. Cutting the frame
+into overlapping model-sized tiles keeps it at native resolution. The overlap
+makes sure every drone lies whole inside at least one tile. Boxes found twice
+in neighbouring tiles, or cut at a tile edge, are merged with NMS on
+intersection-over-smaller-area, so the whole box wins over its clipped copy.
+"""
+
+import math
+import numpy as np
+
+OVERLAP = 0.2      # fraction of a tile shared with its neighbour
+MERGE_THR = 0.6    # boxes overlapping more than this (of the smaller one) are duplicates
+
+
+def _starts(lo, hi, tile, overlap, limit):
+    """
+    Returns:
+        list: Tile start offsets covering [lo, hi) along one axis of length `limit`
+    """
+    span = hi - lo
+    if span <= tile:
+        # Region smaller than a tile: one tile centred on it, kept inside the frame
+        start = lo - (tile - span) // 2
+        return [int(min(max(start, 0), max(limit - tile, 0)))]
+    step = tile * (1 - overlap)
+    count = math.ceil((span - tile) / step) + 1
+    return [int(round(v)) for v in np.linspace(lo, hi - tile, count)]  # spread evenly, last tile flush with hi
+
+
+def tile_grid(width, height, tile, overlap=OVERLAP, region=None):
+    """
+    Overlapping tiles covering the frame, or only a region of it.
+
+    Args:
+        width, height (int): Frame size in pixels
+        tile (int): Tile side (the model input size, so tiles are not rescaled)
+        overlap (float): Fraction of a tile shared with its neighbour
+        region (tuple or None): (x0, y0, x1, y1) to cover instead of the whole frame
+    Returns:
+        list: (x0, y0, x1, y1) per tile
+    """
+    x0, y0, x1, y1 = region or (0, 0, width, height)
+    xs = _starts(x0, x1, tile, overlap, width)
+    ys = _starts(y0, y1, tile, overlap, height)
+    return [(x, y, min(x + tile, width), min(y + tile, height)) for y in ys for x in xs]
+
+
+def merge(boxes, threshold=MERGE_THR):
+    """
+    Greedy NMS across tiles, highest confidence first.
+
+    Args:
+        boxes (list): (x1, y1, x2, y2, conf) in frame pixels
+        threshold (float): Intersection over the smaller box above which the weaker box is dropped
+    Returns:
+        list: Boxes kept
+    """
+    if len(boxes) < 2:
+        return list(boxes)
+    arr = np.asarray(boxes, dtype=np.float64)
+    areas = np.maximum(arr[:, 2] - arr[:, 0], 0) * np.maximum(arr[:, 3] - arr[:, 1], 0)
+    order = np.argsort(-arr[:, 4])
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        iw = np.clip(np.minimum(arr[best, 2], arr[rest, 2]) - np.maximum(arr[best, 0], arr[rest, 0]), 0, None)
+        ih = np.clip(np.minimum(arr[best, 3], arr[rest, 3]) - np.maximum(arr[best, 1], arr[rest, 1]), 0, None)
+        smaller = np.maximum(np.minimum(areas[best], areas[rest]), 1e-9)
+        order = rest[(iw * ih) / smaller <= threshold]
+    return [boxes[i] for i in keep]
@@ -0,0 +1,187 @@
+# tracker.py
+"""
+Multi-object drone tracker with identity persistence.
+
+Turns per-frame detections into tracks with persistent IDs, ByteTrack-style:
+
+  1. High-confidence detections are matched first to every track, gated by
+     distance to the track's predicted (constant-velocity) position.
+  2. Low-confidence detections are then matched only to tracks that are
+     already confirmed, so a briefly weak drone keeps its identity instead of
+     being dropped, while a weak false positive can never start a track.
+  3. Unmatched high-confidence detections start tentative tracks, which only
+     become confirmed after MIN_HITS consecutive matches.
+
+A single reflection or person-shaped false positive therefore cannot move a
+confirmed track: it is outside the gate, and its own tentative track is
+discarded long before it would be confirmed.
+"""
+
+import time
+import itertools
+from collections import namedtuple
+
+HIGH_THR = 0.5        # detections at or above this can start and confirm tracks
+LOW_THR = 0.1         # detections between LOW_THR and HIGH_THR only extend confirmed tracks
+GATE_PX = 200         # max distance (output pixels) between a prediction and its matched detection
+GATE_GROWTH = 0.25    # gate widens by this fraction per missed frame, as the prediction gets less certain
+GATE_MAX_PX = 400     # upper bound on the widened gate
+MIN_HITS = 3          # consecutive matches before a tentative track is confirmed
+MAX_MISSES = 15       # frames a confirmed track survives without a match
+TENTATIVE_MISSES = 1  # frames a tentative track survives without a match
+QUALITY_ALPHA = 0.3   # smoothing of the per-track confidence average
+MISS_DECAY = 0.8      # quality multiplier per consecutive missed frame
+
+# Immutable per-frame view of a track, safe to hand to other threads
+TrackState = namedtuple("TrackState", "id x y vx vy stamp confirmed quality misses")
+
+
+class Track:
+    """
+    Constant-velocity track of one drone in output coordinates.
+    """
+
+    def __init__(self, track_id, x, y, conf, stamp):
+        self.id = track_id
+        self.x, self.y = float(x), float(y)
+        self.vx = self.vy = 0.0  # pixels per second
+        self.stamp = stamp       # time of the last matched detection
+        self.hits = 1            # consecutive matched frames
+        self.misses = 0          # consecutive missed frames
+        self.confirmed = False
+        self.conf_avg = conf     # smoothed detection confidence
+
+    def predict(self, now):
+        """
+        Returns:
+            (x, y): Expected position at time `now`
+        """
+        dt = now - self.stamp
+        return self.x + self.vx * dt, self.y + self.vy * dt
+
+    def gate(self, base):
+        """
+        Returns:
+            float: Matching radius, widened for every frame without a match
+        """
+        return min(base * (1 + GATE_GROWTH * self.misses), max(base, GATE_MAX_PX))
+
+    def correct(self, x, y, conf, now, alpha=0.5):
+        """
+        Move the track onto a matched detection and update its velocity.
+        """
+        dt = now - self.stamp
+        if dt > 0:
+            self.vx = alpha * (x - self.x) / dt + (1 - alpha) * self.vx
+            self.vy = alpha * (y - self.y) / dt + (1 - alpha) * self.vy
+        self.x, self.y = float(x), float(y)
+        self.stamp = now
+        self.hits += 1
+        self.misses = 0
+        self.conf_avg += QUALITY_ALPHA * (conf - self.conf_avg)
+        if self.hits >= MIN_HITS:
+            self.confirmed = True
+
+    def miss(self):
+        self.hits = 0
+        self.misses += 1
+
+    def quality(self):
+        """
+        Returns:
+            float: 0..1 score from smoothed confidence, decayed while unmatched
+        """
+        return self.conf_avg * (MISS_DECAY ** self.misses) if self.confirmed else 0.0
+
+    def state(self):
+        return TrackState(self.id, self.x, self.y, self.vx, self.vy, self.stamp,
+                          self.confirmed, self.quality(), self.misses)
+
+
+class Tracker:
+    """
+    Assigns persistent IDs to detections across frames.
+    """
+
+    def __init__(self, gate=GATE_PX, max_misses=MAX_MISSES, high_thr=HIGH_THR, low_thr=LOW_THR):
+        self.gate = gate
+        self.max_misses = max_misses
+        self.high_thr = high_thr
+        self.low_thr = low_thr
+        self.tracks = []
+        self.primary_id = None  # track followed by the single-drone mission
+        self._ids = itertools.count(1)
+
+    def _associate(self, tracks, detections, now):
+        """
+        Greedy nearest-first matching of detections to track predictions.
+
+        Returns:
+            (matched track indices, matched detection indices) into the given lists
+        """
+        pairs = []
+        for ti, track in enumerate(tracks):
+            px, py = track.predict(now)
+            gate = track.gate(self.gate)
+            for di, (x, y, _) in enumerate(detections):
+                dist = ((x - px) ** 2 + (y - py) ** 2) ** 0.5
+                if dist <= gate:
+                    pairs.append((dist, ti, di))
+        pairs.sort()
+
+        used_tracks, used_dets = set(), set()
+        for _, ti, di in pairs:
+            if ti in used_tracks or di in used_dets:
+                continue
+            x, y, conf = detections[di]
+            tracks[ti].correct(x, y, conf, now)
+            used_tracks.add(ti)
+            used_dets.add(di)
+        return used_tracks, used_dets
+
+    def update(self, detections, now=None):
+        """
+        Args:
+            detections (list): (x, y, conf) tuples in output coordinates
+            now (float or None): Frame time, defaults to time.monotonic()
+        Returns:
+            dict: Track ID -> TrackState for every live track (confirmed or not)
+        """
+        now = time.monotonic() if now is None else now
+        high = [d for d in detections if d[2] >= self.high_thr]
+        low = [d for d in detections if self.low_thr <= d[2] < self.high_thr]
+
+        # Stage 1: confident detections against every track
+        matched, used_high = self._associate(self.tracks, high, now)
+
+        # Stage 2: weak detections may only extend confirmed tracks left over from stage 1
+        leftover = [t for i, t in enumerate(self.tracks) if i not in matched and t.confirmed]
+        matched_low, _ = self._associate(leftover, low, now)
+        matched_ids = {self.tracks[i].id for i in matched} | {leftover[i].id for i in matched_low}
+
+        for track in self.tracks:
+            if track.id not in matched_ids:
+                track.miss()
+        self.tracks = [
+            t for t in self.tracks
+            if t.misses <= (self.max_misses if t.confirmed else TENTATIVE_MISSES)
+        ]
+
+        for di, (x, y, conf) in enumerate(high):
+            if di not in used_high:
+                self.tracks.append(Track(next(self._ids), x, y, conf, now))  # candidate: tentative until MIN_HITS
+
+        return {t.id: t.state() for t in self.tracks}
+
+    def primary(self):
+        """
+        The track the single-drone mission should follow: the current primary
+        while it survives, otherwise the best confirmed track.
+
+        Returns:
+            TrackState or None
+        """
+        live = {t.id: t for t in self.tracks if t.confirmed}
+        if self.primary_id not in live:
+            self.primary_id = max(live, key=lambda i: live[i].quality(), default=None)
+        return live[self.primary_id].state() if self.primary_id is not None else None
@@ -1,4 +1,4 @@
-import navigation as NAV, udp_sender as UDP, time, gui, threading, yolo, drone_feed, re  # import modules for nav logic, UDP comms, timing, and GUI
+import navigation as NAV, udp_sender as UDP, time, gui, threading, yolo, re, calibration  # import modules for nav logic, UDP comms, timing, and GUI
 
 DELAY = 0.5  # seconds to wait between successive UDP commands
 FLIP_DELAY = 1
@@ -6,6 +6,19 @@ FLIP_DELAY = 1
 STREAMING = False  # flag to indicate if video stream is active, to prevent multiple threads from starting it (it crashes if started twice)
 # Note: The UDP_sender module is assumed to handle the socket connection and command sending.
 
+FIX_WAIT = 2.0  # seconds a move waits for the vision track to become confirmed before giving up
+
+ADAPTIVE_GAIN = True  # learn px-per-cm from observed moves instead of the fixed navigation scale
+calibrator = None  # calibration.GainCalibrator for the current camera setup, created on first move
+CALIBRATION_SETUP = None  # explicit calibration.json key (e.g. "lab-ceiling"); None = derived from the negotiated camera mode and weights
+attempts_log = []  # (waypoint, attempts used or None if not reached) for the current mission
+
+MISSION_STATE = "idle"  # current phase of the mission loop, for monitoring
+CURRENT_WAYPOINT = None  # waypoint being flown to, for monitoring
+
+VO = None  # visual_odometry module once its fallback is running
+FIX_ESTIMATED = False  # True when the last fix came from visual odometry rather than the external camera
+
 INITIALIZED = False # flag to indicate if the UDP (command, streamon) connection has been initialized, to prevent re-initialization and making the drone misbehave.
 
 '''Check if current position is within given tolerances of target.'''
@@ -28,27 +41,123 @@ def is_close_enough(current, target, x_tol=100, y_tol=50):
     return dx <= x_tol and dy <= y_tol  # within both tolerances
 
 '''Send a Tello UDP command if its value exceeds thresholds.'''
-def send_command_if_needed(cmd, skip_threshold=5, min_value=20):
+def send_command_if_needed(cmd, skip_threshold=5, min_value=20, send=None):
     """
     Args:
         cmd (str): Command string in format '<direction> <value>'
         skip_threshold (int): Values <= this are ignored
         min_value (int): Smallest value to send if above skip_threshold
+        send (callable or None): Sender to use, defaults to UDP.send_command
+    Returns:
+        int: Value actually sent (after the minimum bump), 0 if skipped
     """
     direction, value_str = cmd.split()  # split into action and amount
     value = int(value_str)  # convert amount to integer
 
     if value <= skip_threshold:
         print(f"Skipping small movement: {cmd}")  # ignore negligible adjustments
-        return
+        return 0
 
     if value < min_value:
         value = min_value  # enforce minimum movement
     cmd_to_send = f"{direction} {value}"  # reconstruct command
 
     print(f"[UDP] Sending: {cmd_to_send}")  # debug output
-    UDP.send_command(cmd_to_send)  # transmit over UDP
+    (send or UDP.send_command)(cmd_to_send)  # transmit over UDP
     time.sleep(DELAY)  # enforce pacing between commands
+    return value
+
+'''Signed distance of a Tello move along its axis.'''
+def signed_cm(direction, value):
+    """
+    Returns:
+        int: value, negative for 'back' and 'left'
+    """
+    return -value if direction in ("back", "left") else value
+
+'''Calibrator for the current camera setup.'''
+def get_calibrator():
+    """
+    Returns:
+        calibration.GainCalibrator or None when ADAPTIVE_GAIN is off
+    """
+    global calibrator
+    if ADAPTIVE_GAIN and calibrator is None:
+        calibrator = calibration.GainCalibrator(calibration_key())
+    return calibrator if ADAPTIVE_GAIN else None
+
+'''Key the learned gains are stored under.'''
+def calibration_key():
+    """
+    Returns:
+        str: CALIBRATION_SETUP when set, otherwise built from the camera mode the
+        vision side negotiated (the requested one until the camera is open) and the weights
+    """
+    if CALIBRATION_SETUP:
+        return CALIBRATION_SETUP
+    fourcc, width, height = yolo.camera_mode or ("any", yolo.PROC_W, yolo.PROC_H)
+    return calibration.setup_key(yolo.CAM_IDX, fourcc, width, height, yolo.WEIGHTS)
+
+'''Pixel error to Tello commands, with learned gains when available.'''
+def commands_for(loc, dest):
+    """
+    Returns:
+        (forward_cmd, sideways_cmd)
+    """
+    calib = get_calibrator()
+    return calib.commands(loc, dest) if calib else NAV.calculate_from_pixels(loc, dest)
+
+'''Send one axis move and learn the gain from the fixes around it.'''
+def send_and_observe(cmd, axis, before):
+    """
+    Args:
+        cmd (str): '<direction> <value>' command
+        axis (str): "forward" or "sideways"
+        before (tuple): Confirmed location before the move
+    Returns:
+        tuple or None: Confirmed location after the move
+    """
+    estimated_before = FIX_ESTIMATED
+    sent = send_command_if_needed(cmd)
+    after = wait_for_confirmed_track()  # fresh fix once the move has settled
+    calib = get_calibrator()
+    if sent and calib and not (estimated_before or FIX_ESTIMATED):  # learn from external fixes only
+        calib.observe(axis, signed_cm(cmd.split()[0], sent), before, after)
+    return after
+
+'''Fused location from the visual-odometry fallback, if it is running.'''
+def fused_location():
+    """
+    Returns:
+        tuple or None: External fix blended with odometry, or the odometry
+        estimate while the external fix is missing
+    """
+    return VO.location() if VO is not None else None
+
+'''Wait briefly for a confirmed vision track.'''
+def wait_for_confirmed_track(timeout=FIX_WAIT):
+    """
+    Args:
+        timeout (float): Seconds to wait
+    Returns:
+        tuple or None: Confirmed drone location (or the odometry estimate while
+        the external track is lost), or None if neither is available
+    """
+    global FIX_ESTIMATED
+    deadline = time.monotonic() + timeout
+    while not yolo.drone_confirmed:  # track lost or only a tentative candidate
+        estimate = fused_location()
+        if estimate is not None:
+            print(f"[UDP] External track lost; using odometry estimate {estimate}")
+            FIX_ESTIMATED = True
+            return estimate
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.05)
+    # A confirmed track that is coasting (missed detections) is dead-reckoned by the
+    # odometry fusion too, so the flag follows the estimator rather than the track state
+    FIX_ESTIMATED = VO is not None and VO.estimator.estimating
+    return fused_location() or yolo.drone_location
 
 '''Calculate and send moves to approach a single waypoint.'''
 def move_to_destination(dest):
@@ -60,24 +169,28 @@ def move_to_destination(dest):
     """
     time.sleep(DELAY)  # brief pause before computing
 
-    loc = yolo.drone_location  # read latest position
+    loc = wait_for_confirmed_track()  # read latest position, only from a confirmed track
     if loc is None:
-        print("[UDP] No vision data; skipping move.")  # cannot navigate without a fix
+        print(f"[UDP] No confirmed track (quality {yolo.track_quality:.2f}); skipping move.")  # cannot navigate without a fix
         return False
 
     # Step 1: compute forward/backward and sideways adjustments
-    fwd_cmd, side_cmd = NAV.calculate_from_pixels(loc, dest)  # initial commands
+    fwd_cmd, side_cmd = commands_for(loc, dest)  # initial commands
     print(f"[UDP] 1. Calculated cmds: {fwd_cmd}, {side_cmd}")  # report for debugging
-    send_command_if_needed(fwd_cmd)  # send forward/backward
+    loc = send_and_observe(fwd_cmd, "forward", loc)  # send forward/backward, get updated position
 
     # Step 2: recompute and send lateral adjustment
-    loc = yolo.drone_location  # get updated position
-    _, side_cmd = NAV.calculate_from_pixels(loc, dest)  # adjust sideways only
+    if loc is None:
+        print("[UDP] Track lost after forward move; skipping sideways move.")
+        return False
+    _, side_cmd = commands_for(loc, dest)  # adjust sideways only
     print(f"[UDP] 2. Sideways cmd: {side_cmd}")  # log lateral move
-    send_command_if_needed(side_cmd)  # send sideways
+    final_loc = send_and_observe(side_cmd, "sideways", loc)  # send sideways
 
     # Step 3: verify if within tolerance
-    final_loc = yolo.drone_location  # final position after moves
+    if final_loc is None:
+        print("[UDP] Track lost after sideways move; cannot confirm arrival.")  # a frozen position may predate the move
+        return False
     reached = is_close_enough(final_loc, dest, x_tol=128, y_tol=72)  # check arrival
     print(f"[UDP] Final {final_loc}, reached={reached}")  # summary
     return reached
@@ -88,13 +201,34 @@ def retry_to_reach(dest, max_retries=3):
     Args:
         dest (tuple): Target (x, y) pixel coordinates
         max_retries (int): Number of attempts before giving up
+    Returns:
+        int or None: Attempts used, or None if the destination was not reached
     """
     for attempt in range(1, max_retries + 1):
         if move_to_destination(dest):
-            print(f"[UDP] Destination {dest} reached.")  # success message
-            return
+            print(f"[UDP] Destination {dest} reached in {attempt} attempt(s).")  # success message
+            return attempt
         print(f"[UDP] Retry {attempt}/{max_retries} for {dest}")  # log retry
     print(f"[UDP] Failed to reach {dest} after {max_retries} attempts.")  # final failure
+    return None
+
+'''Summarise attempts per waypoint and store the learned gains.'''
+def report_attempts():
+    if not attempts_log:
+        return
+    print("[UDP] Attempts per waypoint:")
+    for dest, attempts in attempts_log:
+        print(f"[UDP]   {dest}: {attempts if attempts is not None else 'not reached'}")
+    reached = [a for _, a in attempts_log if a is not None]
+    if reached:
+        first_try = sum(1 for a in reached if a == 1)
+        print(f"[UDP] Mean attempts {sum(reached) / len(reached):.2f}, "
+              f"{first_try}/{len(attempts_log)} reached on the first attempt")
+    calib = get_calibrator()
+    if calib:
+        calib.save()
+        print(f"[CALIB] Saved {calib.key}: " + ", ".join(
+            f"{axis} {calib.gain[axis]:.2f} px/cm" for axis in calibration.AXES))
 
 '''Go through all waypoints defined in GUI list.'''
 def execute_mission():
@@ -102,10 +236,15 @@ def execute_mission():
     Returns:
         tuple or None: Last waypoint reached, or None if list empty
     """
+    global CURRENT_WAYPOINT
     last = None  # track last successful destination
+    attempts_log.clear()
     for dest in gui.destination_list:  # iterate waypoints
-        retry_to_reach(dest)  # perform movement with retries
+        CURRENT_WAYPOINT = dest
+        attempts_log.append((dest, retry_to_reach(dest)))  # perform movement with retries
         last = dest  # update last attempted
+    CURRENT_WAYPOINT = None
+    report_attempts()  # attempts per waypoint, persist learned gains
     return last  # return last processed waypoint
 
 def initialize_and_start_stream():
@@ -138,8 +277,10 @@ def initialize_and_start_stream():
         # start the feed thread immediately
         global STREAMING  # access global flag
         if STREAMING != True:
+            import drone_feed  # imported on first use: it pulls in Win32 APIs and is only needed once streaming
             threading.Thread(target=drone_feed.run, daemon=True).start()
             STREAMING = True  # set streaming flag
+            start_odometry()  # fallback position from the feed, when enabled
 
         print('[UDP] Stream started successfully.')
         time.sleep(DELAY)       # brief settling wait
@@ -147,6 +288,14 @@ def initialize_and_start_stream():
         print('[UDP] Stream start failed. Retrying...')
         response = UDP.send_command('streamon')
 
+'''Start the visual-odometry fallback on the drone feed.'''
+def start_odometry():
+    global VO
+    import visual_odometry
+    if visual_odometry.ENABLED:
+        visual_odometry.start()
+        VO = visual_odometry
+
 '''Wait until GUI destination list is populated.'''
 def wait_for_mission():
     """
@@ -189,10 +338,10 @@ def takeoff_sequence():
 '''Wait for initial vision fix.'''
 def wait_for_vision_fix():
     """
-    Blocks until drone_location is set by vision thread.
+    Blocks until the vision thread reports a confirmed drone track.
     """
     print("[UDP] Waiting for vision fix...")  # prompt
-    while yolo.drone_location is None:  # spin until vision thread updates
+    while not yolo.drone_confirmed:  # spin until vision thread confirms a track
         time.sleep(0.1)  # short wait to avoid tight loop
     print(f"[UDP] First fix: {yolo.drone_location}")  # log initial position
 
@@ -230,15 +379,27 @@ def flip_drone():
 
     print("[UDP] Flips complete.")  # confirmation message
 
+'''Record the mission phase for monitoring.'''
+def set_state(state):
+    global MISSION_STATE
+    MISSION_STATE = state
+
 '''Main UDP logic loop triggering missions.'''
 def run():
     print("[UDP] UDP logic thread running...")  # startup notice
     while True:  # continuous operation
+        set_state("awaiting mission")
         wait_for_mission()  # block until destinations provided
+        set_state("initializing")
         initialize_and_start_stream()  # ensure UDP and stream active
+        set_state("takeoff")
         takeoff_sequence()  # lift off
+        set_state("waiting for fix")
         wait_for_vision_fix()  # get first location fix
+        set_state("flying")
         execute_mission()  # fly through all waypoints
         report_status()  # battery and location
+        set_state("flipping")
         flip_drone()  # optional flip command #uncomment to enable flips
+        set_state("landing")
         land_and_cleanup()  # land and reset GUI
@@ -30,13 +30,11 @@ def connect():
 
     raise last_exc  # Raise last exception if none of the IPs worked
 
-def send_tello(cmd: str) -> str:
-    """Send one SDK command and return the response (never blows up on bad bytes)."""
-    if _sock is None:
-        raise RuntimeError("Socket not connected: call connect() first") # Ensure socket is connected
-    _sock.sendto(cmd.encode('utf-8'), (TELLO_IP, TELLO_PORT)) #Encodes the sent command to bytes with UTF-8.
+def exchange(sock, cmd: str, addr) -> str:
+    """Send one SDK command on `sock` to `addr` and return the decoded response."""
+    sock.sendto(cmd.encode('utf-8'), addr) #Encodes the sent command to bytes with UTF-8.
     try:
-        resp, _ = _sock.recvfrom(1024) # Wait for response (max 1024 bytes).
+        resp, _ = sock.recvfrom(1024) # Wait for response (max 1024 bytes).
     except socket.timeout:
         return '(timeout)' # No response received within timeout period
     except ConnectionResetError:
@@ -49,6 +47,12 @@ def send_tello(cmd: str) -> str:
         text = resp.decode('utf-8', errors='ignore') # Ignore bad bytes if decoding fails
     return text.strip() #Returns the decoded bytes as a text string.
 
+def send_tello(cmd: str) -> str:
+    """Send one SDK command and return the response (never blows up on bad bytes)."""
+    if _sock is None:
+        raise RuntimeError("Socket not connected: call connect() first") # Ensure socket is connected
+    return exchange(_sock, cmd, (TELLO_IP, TELLO_PORT))
+
 def send_command(command: str) -> str:
     """Send + print, retrying up to 5 times on '(timeout)'."""
     for attempt in range(1,6):  # Retry loop: max 5 attempts
@@ -64,4 +68,54 @@ def close_socket():
     global _sock
     if _sock:
         _sock.close() # Close the socket
-        _sock = None # Reset the socket variable
\ No newline at end of file
+        _sock = None # Reset the socket variable
+
+class TelloChannel:
+    """
+    Command channel to one drone in swarm mode.
+
+    Each Tello is its own access point at TELLO_IP, so every drone needs its own
+    Wi-Fi adapter; the channel binds to that adapter's address (and, on Linux,
+    to the interface itself) so commands leave through the right radio.
+    """
+
+    def __init__(self, local_ip, local_port=LOCAL_PORT, device=None,
+                 tello_ip=TELLO_IP, tello_port=TELLO_PORT, timeout=TIMEOUT):
+        self.local = (local_ip, local_port)
+        self.device = device # e.g. 'wlan1'; None to rely on the local IP alone
+        self.addr = (tello_ip, tello_port)
+        self.timeout = timeout
+        self.sock = None
+
+    def connect(self):
+        """Open and bind the channel's socket."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(self.timeout)
+        if self.device and hasattr(socket, 'SO_BINDTODEVICE'):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BINDTODEVICE, self.device.encode()) # Linux only, needs CAP_NET_RAW
+        sock.bind(self.local)
+        print(f"Bound to {self.local[0]}:{self.local[1]}" + (f" on {self.device}" if self.device else ""))
+        self.sock = sock
+        return sock
+
+    def send_tello(self, cmd: str) -> str:
+        """Send one SDK command on this channel and return the response."""
+        if self.sock is None:
+            raise RuntimeError("Channel not connected: call connect() first")
+        return exchange(self.sock, cmd, self.addr)
+
+    def send_command(self, command: str) -> str:
+        """Send + print, retrying up to 5 times on '(timeout)'."""
+        for attempt in range(1,6):
+            response = self.send_tello(command)
+            print(f"[{self.local[0]}] Response: {response}")
+            if response != '(timeout)':
+                return response
+            print(f"[{self.local[0]}] ↻ Timeout #{attempt} for '{command}', retrying…")
+        return response
+
+    def close(self):
+        """Cleanly close the channel's socket."""
+        if self.sock:
+            self.sock.close()
+            self.sock = None
@@ -0,0 +1,270 @@
+# vision_shm.py
+"""
+Shared-memory frame and position buffers for the multi-process layout.
+
+The vision process writes annotated frames and drone positions into
+multiprocessing.shared_memory blocks; the GUI/mission process reads them
+directly, without pickling or queues. Every record is guarded by a
+sequence counter (seqlock): the writer makes it odd while writing and even
+when done, so a reader that sees an odd or changed counter simply retries.
+"""
+
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+FRAME_SLOTS = 2        # double buffer: readers use one slot while the writer fills the other
+POLL_INTERVAL = 0.0005 # seconds between seqlock retries while the writer laps a frame slot
+WAIT_POLL = 0.005      # seconds between polls in wait_newer when no wake-up event is shared
+
+# Frame header layout (int64): height, width, channels, slots, latest slot, latest seq, then one seq per slot
+_HDR_H, _HDR_W, _HDR_C, _HDR_SLOTS, _HDR_LATEST, _HDR_SEQ = range(6)
+_FRAME_HDR_LEN = 6 + FRAME_SLOTS
+_FRAME_HDR_BYTES = _FRAME_HDR_LEN * 8
+
+# Position record layout (float64 after an int64 seq): x, y, valid, timestamp, track quality
+_POS_FIELDS = 5
+_POS_BYTES = 8 + _POS_FIELDS * 8
+
+
+class FrameBuffer:
+    """
+    Double-buffered BGR frame store in shared memory, single writer, many readers.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self._hdr = np.ndarray((_FRAME_HDR_LEN,), dtype=np.int64, buffer=shm.buf)
+        h, w, c, slots = (int(v) for v in self._hdr[:4])
+        self.shape = (h, w, c)
+        self._slots = np.ndarray(
+            (slots, h, w, c), dtype=np.uint8, buffer=shm.buf, offset=_FRAME_HDR_BYTES
+        )
+
+    @classmethod
+    def create(cls, name, height, width, channels=3):
+        """
+        Args:
+            name (str): Shared memory block name
+            height (int): Frame height in pixels
+            width (int): Frame width in pixels
+            channels (int): Colour channels per pixel
+        Returns:
+            FrameBuffer: Owning buffer (call unlink() when done)
+        """
+        size = _FRAME_HDR_BYTES + FRAME_SLOTS * height * width * channels
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        hdr = np.ndarray((_FRAME_HDR_LEN,), dtype=np.int64, buffer=shm.buf)
+        hdr[:] = 0
+        hdr[_HDR_H], hdr[_HDR_W], hdr[_HDR_C], hdr[_HDR_SLOTS] = height, width, channels, FRAME_SLOTS
+        del hdr  # release the export so the block can be closed later
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Args:
+            name (str): Name of a block created by FrameBuffer.create
+        Returns:
+            FrameBuffer: Non-owning view of the block
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def begin_write(self):
+        """
+        Mark the next slot as being written and return it for in-place filling.
+
+        Returns:
+            (slot index, writable ndarray view)
+        """
+        slot = (int(self._hdr[_HDR_LATEST]) + 1) % FRAME_SLOTS
+        self._hdr[6 + slot] += 1  # odd: slot is being written
+        return slot, self._slots[slot]
+
+    def end_write(self, slot):
+        """
+        Publish a slot filled after begin_write().
+        """
+        self._hdr[6 + slot] += 1  # even: slot is consistent again
+        self._hdr[_HDR_LATEST] = slot
+        self._hdr[_HDR_SEQ] += 1
+
+    def write(self, frame):
+        """
+        Copy a frame into the next slot and publish it.
+
+        Args:
+            frame (ndarray): HxWxC uint8 image matching the buffer shape
+        """
+        slot, view = self.begin_write()
+        np.copyto(view, frame)
+        self.end_write(slot)
+
+    def seq(self):
+        """
+        Returns:
+            int: Number of frames published so far
+        """
+        return int(self._hdr[_HDR_SEQ])
+
+    def view(self):
+        """
+        Zero-copy access to the latest frame.
+
+        The view stays valid until the writer wraps around to the same slot;
+        check with is_valid() after using it.
+
+        Returns:
+            (slot, slot seq, ndarray view) or None if nothing was published yet
+        """
+        if self.seq() == 0:
+            return None
+        while True:
+            slot = int(self._hdr[_HDR_LATEST])
+            slot_seq = int(self._hdr[6 + slot])
+            if slot_seq % 2 == 0:
+                return slot, slot_seq, self._slots[slot]
+            time.sleep(POLL_INTERVAL)  # writer lapped us onto this slot; retry
+
+    def is_valid(self, slot, slot_seq):
+        """
+        Returns:
+            bool: True if the slot has not been rewritten since view() returned it
+        """
+        return int(self._hdr[6 + slot]) == slot_seq
+
+    def read(self, out):
+        """
+        Copy the latest consistent frame into a caller-owned buffer.
+
+        Args:
+            out (ndarray): Preallocated array with the buffer shape
+        Returns:
+            int: Frame seq that was copied, or 0 if nothing was published yet
+        """
+        while True:
+            seq = self.seq()
+            latest = self.view()
+            if latest is None:
+                return 0
+            slot, slot_seq, frame = latest
+            np.copyto(out, frame)
+            if self.is_valid(slot, slot_seq):
+                return seq
+
+    def close(self):
+        """
+        Detach from the block, removing it as well when we own it.
+        """
+        self._hdr = self._slots = None  # drop exports before closing
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class PositionBuffer:
+    """
+    Seqlock-protected drone position record in shared memory.
+
+    Both ends may share a multiprocessing.Event: the writer sets it on every
+    write, so a reader blocked in wait_newer wakes at once instead of polling.
+    """
+
+    def __init__(self, shm, owner, event=None):
+        self.shm = shm
+        self.owner = owner
+        self.event = event  # set on every write; one reader waits on it
+        self._seq = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+        self._data = np.ndarray((_POS_FIELDS,), dtype=np.float64, buffer=shm.buf, offset=8)
+
+    @classmethod
+    def create(cls, name, event=None):
+        """
+        Args:
+            name (str): Shared memory block name
+            event (Event or None): Wake-up event shared with the other end
+        Returns:
+            PositionBuffer: Owning buffer (call close() when done)
+        """
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_POS_BYTES)
+        shm.buf[:_POS_BYTES] = bytes(_POS_BYTES)  # zero seq and record
+        return cls(shm, owner=True, event=event)
+
+    @classmethod
+    def attach(cls, name, event=None):
+        """
+        Args:
+            name (str): Name of a block created by PositionBuffer.create
+            event (Event or None): Wake-up event shared with the other end
+        Returns:
+            PositionBuffer: Non-owning view of the block
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False, event=event)
+
+    def write(self, location, quality=1.0):
+        """
+        Publish a position; None marks the position as unknown.
+
+        Args:
+            location (tuple or None): (x, y) in output coordinates
+            quality (float): Track quality, 0 when the track is not confirmed
+        """
+        self._seq[0] += 1  # odd: record is being written
+        if location is None:
+            self._data[2] = 0.0
+        else:
+            self._data[0], self._data[1] = location
+            self._data[2] = 1.0
+        self._data[3] = time.time()
+        self._data[4] = quality
+        self._seq[0] += 1  # even: record is consistent
+        if self.event is not None:
+            self.event.set()
+
+    def read(self):
+        """
+        Returns:
+            (seq, location or None, timestamp, quality) from a consistent snapshot
+        """
+        while True:
+            s1 = int(self._seq[0])
+            if s1 % 2:
+                continue  # writer is mid-update
+            x, y, valid, stamp, quality = self._data.tolist()
+            if int(self._seq[0]) == s1:
+                location = (int(x), int(y)) if valid else None
+                return s1, location, stamp, quality
+
+    def wait_newer(self, last_seq, timeout=None):
+        """
+        Block until a record newer than last_seq is published.
+
+        Args:
+            last_seq (int): Seq returned by the previous read
+            timeout (float or None): Seconds to wait before giving up
+        Returns:
+            (seq, location, timestamp, quality), or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.event is not None:
+                self.event.clear()  # before the check, so a write after it still wakes us
+            if int(self._seq[0]) > last_seq and not int(self._seq[0]) % 2:
+                return self.read()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if self.event is not None:
+                self.event.wait(remaining)
+            else:
+                time.sleep(WAIT_POLL if remaining is None else min(WAIT_POLL, remaining))
+
+    def close(self):
+        """
+        Detach from the block, removing it as well when we own it.
+        """
+        self._seq = self._data = None  # drop exports before closing
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
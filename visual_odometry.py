@@ -0,0 +1,283 @@
+# visual_odometry.py
+"""
+Visual-odometry fallback from the Tello's own camera.
+
+When the external camera loses the drone (occlusion, leaving the frame),
+yolo.drone_location freezes at the last fix and every move is computed from a
+stale position. This module keeps an estimate going from the drone feed:
+
+  * drone_feed hands each frame to feed(), which writes a small grayscale
+    copy into shared memory (vision_shm.FrameBuffer);
+  * a worker process tracks sparse corners between consecutive frames
+    (Shi-Tomasi + pyramidal Lucas-Kanade) and publishes the integrated
+    camera displacement through a vision_shm.PositionBuffer, with the RANSAC
+    inlier ratio as its quality;
+  * a fusion thread in this process learns the linear map from odometry
+    displacement to external-camera pixels while both are available. While
+    the external fix is missing, it dead-reckons from the last fix. When the
+    fix returns, it fades the remaining difference out over BLEND_TAU
+    seconds instead of jumping.
+
+The downward camera (Tello EDU "downvision 1") gives the best estimate, but
+the forward camera works too for sideways and vertical motion.
+"""
+
+import os
+import time
+import threading
+import multiprocessing
+import cv2
+import numpy as np
+import vision_shm
+
+ENABLED = False          # start the worker with the drone stream (udp_logic)
+ODOM_W, ODOM_H = 320, 240  # worker frame size; LK is run on this
+MAX_CORNERS = 200
+MIN_CORNERS = 40         # re-detect corners when fewer survive
+MIN_INLIERS = 0.5        # frames whose inlier ratio is lower are not integrated
+MIN_QUALITY = 0.5        # odometry quality needed for the fallback
+FUSE_INTERVAL = 0.05     # seconds between fusion updates
+FIT_MIN_PX = 8           # odometry displacement (worker pixels) needed for a fitting sample
+FIT_MIN_SAMPLES = 5      # samples before the odometry->external map is trusted
+FIT_FORGET = 0.95        # weight kept by old fitting samples per new one
+FIT_RIDGE = 1.0          # regularisation, so an axis the drone has not moved along maps to ~0 instead of failing
+MAX_DEAD_RECKON = 10.0   # seconds of fallback before the estimate is dropped as too drifty
+BLEND_TAU = 0.5          # seconds for the fallback/external difference to fade to 1/e
+
+
+def worker(frame_shm, odom_shm, stop_event):
+    """
+    Worker process: LK feature tracking on the shared frames.
+
+    Args:
+        frame_shm (str): Name of the grayscale vision_shm.FrameBuffer block
+        odom_shm (str): Name of the vision_shm.PositionBuffer for the displacement
+        stop_event (Event): Set by the parent to stop
+    """
+    frames = vision_shm.FrameBuffer.attach(frame_shm)
+    odom = vision_shm.PositionBuffer.attach(odom_shm)
+    current = np.empty(frames.shape, dtype=np.uint8)
+    previous = np.empty(frames.shape, dtype=np.uint8)
+    mask = np.empty(frames.shape[:2], dtype=np.uint8)  # keeps topped-up corners away from tracked ones
+    points = None
+    total = np.zeros(2)
+    seq = 0
+    try:
+        while not stop_event.is_set():
+            if frames.seq() == seq:
+                time.sleep(0.002)
+                continue
+            seq = frames.read(current)
+            gray = current[:, :, 0]
+            tracked = points is not None and len(points) >= 6
+            quality = 0.0
+            if tracked:
+                # Integrate the step with the surviving corners even when a top-up is due;
+                # skipping it would lose a frame of motion at every re-detection
+                moved, status, _ = cv2.calcOpticalFlowPyrLK(previous[:, :, 0], gray, points, None,
+                                                            winSize=(21, 21), maxLevel=3)
+                ok = status.reshape(-1) == 1
+                survivors = None
+                if ok.sum() >= 6:
+                    matrix, inliers = cv2.estimateAffinePartial2D(points[ok], moved[ok], method=cv2.RANSAC,
+                                                                  ransacReprojThreshold=2.0)
+                    if matrix is not None:
+                        quality = float(inliers.mean())
+                        if quality >= MIN_INLIERS:
+                            total -= matrix[:, 2]  # scene shift is opposite to the camera's motion
+                        survivors = moved[ok][inliers.reshape(-1) == 1].reshape(-1, 1, 2)
+                points = survivors
+
+            if points is None or len(points) < MIN_CORNERS:
+                # Top up with fresh corners on this frame, away from the ones still tracked
+                mask.fill(255)
+                for x, y in ([] if points is None else points.reshape(-1, 2)):
+                    cv2.circle(mask, (int(x), int(y)), 8, 0, -1)
+                wanted = MAX_CORNERS - (0 if points is None else len(points))
+                fresh = cv2.goodFeaturesToTrack(gray, wanted, 0.01, 8, mask=mask)
+                if fresh is not None:
+                    points = fresh if points is None else np.concatenate([points, fresh.astype(points.dtype)])
+                if not tracked:
+                    quality = 0.0 if points is None else 1.0  # nothing to track against yet; total is unchanged
+            odom.write(tuple(total), quality)
+            previous, current = current, previous  # next frame is tracked against this one
+    finally:
+        frames.close()
+        odom.close()
+
+
+class FallbackEstimator:
+    """
+    Fuses external fixes with odometry displacement.
+    """
+
+    def __init__(self):
+        self.last_fix = None       # (external location, odometry at that time)
+        self.fit_anchor = None     # same, start of the current fitting sample
+        self.sxx = np.zeros((2, 2))  # Σ odom·odomᵀ
+        self.syx = np.zeros((2, 2))  # Σ external·odomᵀ
+        self.samples = 0
+        self.fallback_since = None
+        self.estimate = None       # last dead-reckoned location
+        self.residual = None       # (difference, time) being faded out after a fix returns
+        self.location = None       # fused location for the control loop
+        self.estimating = False    # True while location comes from odometry only
+
+    def mapping(self):
+        """
+        Returns:
+            2x2 ndarray or None: Odometry displacement -> external pixels, once fitted
+        """
+        if self.samples < FIT_MIN_SAMPLES:
+            return None
+        return self.syx @ np.linalg.inv(self.sxx + FIT_RIDGE * np.eye(2))
+
+    def _fit(self, fix, odom):
+        if self.fit_anchor is None:
+            self.fit_anchor = (fix, odom)
+            return
+        d_odom = np.subtract(odom, self.fit_anchor[1])
+        if np.hypot(*d_odom) < FIT_MIN_PX:
+            return  # wait for a displacement that stands out from tracking noise
+        d_ext = np.subtract(fix, self.fit_anchor[0])
+        self.sxx = FIT_FORGET * self.sxx + np.outer(d_odom, d_odom)
+        self.syx = FIT_FORGET * self.syx + np.outer(d_ext, d_odom)
+        self.samples += 1
+        self.fit_anchor = (fix, odom)
+
+    def update(self, fix, odom, odom_quality, now=None):
+        """
+        Args:
+            fix (tuple or None): Fresh external location, None while it is missing
+            odom (tuple or None): Integrated odometry displacement
+            odom_quality (float): Odometry tracking quality 0..1
+            now (float or None): Defaults to time.monotonic()
+        Returns:
+            tuple or None: Fused location
+        """
+        now = time.monotonic() if now is None else now
+        odom_ok = odom is not None and odom_quality >= MIN_QUALITY
+
+        if fix is not None:
+            if self.fallback_since is not None and self.estimate is not None:
+                self.residual = (np.subtract(self.estimate, fix), now)  # fade this out rather than jump
+                print(f"[ODOM] External fix back after {now - self.fallback_since:.1f}s; "
+                      f"estimate was off by {np.hypot(*self.residual[0]):.0f}px")
+            self.fallback_since = self.estimate = None
+            self.estimating = False
+            if odom_ok:
+                self._fit(fix, odom)
+                self.last_fix = (fix, odom)
+            else:
+                self.fit_anchor = None
+                self.last_fix = (fix, None)
+            location = np.asarray(fix, dtype=float)
+            if self.residual is not None:
+                offset, since = self.residual
+                weight = np.exp(-(now - since) / BLEND_TAU)
+                if weight < 0.05:
+                    self.residual = None
+                else:
+                    location = location + offset * weight
+            self.location = (int(location[0]), int(location[1]))
+            return self.location
+
+        # External fix missing: dead-reckon from the last fix
+        self.fit_anchor = None
+        if self.fallback_since is None:
+            self.fallback_since = now
+        matrix = self.mapping()
+        if (not odom_ok or matrix is None or self.last_fix is None or self.last_fix[1] is None
+                or now - self.fallback_since > MAX_DEAD_RECKON):
+            self.estimating = False
+            self.estimate = None
+            self.location = None
+            return None
+        base, base_odom = self.last_fix
+        location = np.asarray(base, dtype=float) + matrix @ np.subtract(odom, base_odom)
+        self.estimate = (int(location[0]), int(location[1]))
+        self.estimating = True
+        self.location = self.estimate
+        return self.location
+
+
+estimator = FallbackEstimator()
+_link = None  # (process, frames, odom, stop_event) while running
+_gray = None  # reused resize buffer for feed()
+
+
+def start():
+    """
+    Start the worker process and the fusion thread (once).
+    """
+    global _link
+    if _link is not None:
+        return
+    tag = os.getpid()
+    frames = vision_shm.FrameBuffer.create(f"vm_odom_frames_{tag}", ODOM_H, ODOM_W, 1)
+    odom = vision_shm.PositionBuffer.create(f"vm_odom_{tag}")
+    stop_event = multiprocessing.Event()
+    proc = multiprocessing.Process(target=worker, args=(frames.shm.name, odom.shm.name, stop_event),
+                                   name="odometry", daemon=True)
+    proc.start()
+    _link = (proc, frames, odom, stop_event)
+    threading.Thread(target=fuse_loop, args=(odom, stop_event), name="odometry-fuse", daemon=True).start()
+    print("[ODOM] Visual-odometry fallback started")
+
+
+def feed(frame):
+    """
+    Hand a drone-feed frame to the worker. No-op unless started.
+    """
+    global _gray
+    link = _link
+    if link is None:
+        return
+    frames = link[1]
+    _gray = cv2.resize(frame, (ODOM_W, ODOM_H), dst=_gray, interpolation=cv2.INTER_AREA)
+    slot, view = frames.begin_write()
+    cv2.cvtColor(_gray, cv2.COLOR_BGR2GRAY, dst=view.reshape(ODOM_H, ODOM_W))  # straight into the shared slot
+    frames.end_write(slot)
+
+
+def fuse_loop(odom, stop_event):
+    import yolo
+    was_estimating = False
+    while not stop_event.is_set():
+        _, displacement, _, quality = odom.read()
+        track = yolo.drone_track
+        fresh = yolo.drone_confirmed and (track is None or track.misses == 0)  # drone_track is only set in-process
+        estimator.update(yolo.drone_location if fresh else None, displacement, quality)
+        if estimator.estimating != was_estimating:
+            was_estimating = estimator.estimating
+            print("[ODOM] External fix lost; using odometry estimate" if was_estimating
+                  else "[ODOM] Odometry estimate ended")
+        time.sleep(FUSE_INTERVAL)
+
+
+def location():
+    """
+    Returns:
+        tuple or None: Fused location (blended external fix, or the odometry
+        estimate while the fix is missing); None when not running or unknown
+    """
+    return estimator.location if _link is not None else None
+
+
+def stop():
+    """
+    Stop the worker and release the shared memory.
+    """
+    global _link
+    if _link is None:
+        return
+    proc, frames, odom, stop_event = _link
+    _link = None
+    stop_event.set()
+    proc.join(timeout=2)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+    time.sleep(2 * FUSE_INTERVAL)  # let the fusion thread notice before its buffer closes
+    frames.close()
+    odom.close()
@@ -5,17 +5,48 @@ Processes live camera frames with a YOLO model, annotates detections,
 and shares drone position via UDP logic.
 """
 
+import time            # Per-frame latency for the quality controller
+import threading       # Model load overlaps camera start-up
+from concurrent.futures import ThreadPoolExecutor  # Optional parallel tile inference
 import cv2             # OpenCV for image capture and display
-from ultralytics import YOLO  # Ultralytics YOLO model API
+import camera          # Format negotiation and fast JPEG decode for the external camera
+import numpy as np     # Dummy frame for model warm-up
+import startup         # Startup timing marks
+import monitor_server  # Optional live-monitoring HTTP server
+import tracker         # Multi-object tracking with persistent IDs
+import latency_budget  # Steps quality down/up to hold the frame-latency budget
+import tiling          # Tile layout and cross-tile NMS for small, distant drones
+import vision_shm      # Shared-memory buffers for the multi-process layout
 
 # Configuration constants
-WEIGHTS       = "best.pt"  # trained model weights
+WEIGHTS       = "best.pt"  # trained model weights, or the INT8 "best_int8.onnx" published by quantize.py
 CAM_IDX       = 1              # Camera index for cv2.VideoCapture
+CAM_FPS       = 30             # Requested capture rate
+CAM_DECODE_JPEG = False        # Decode MJPEG ourselves, DCT-downscaled towards INFER_SIZE (where the backend allows it)
 PROC_W, PROC_H = 1920, 1080    # Resolution for processing frames
 OUT_W, OUT_H   = 1920, 1080    # Resolution for output/display scaling
-CONF_THR      = 0.5            # Confidence threshold for detections
+INFER_SIZE    = 640            # Model input size (letterboxed); see model_sweep.py for picking it
+CONF_THR      = 0.5            # Confidence threshold for detections that can start/confirm a track
+LOW_CONF_THR  = 0.1            # Weaker detections are kept as candidates that only extend confirmed tracks
+MIN_TRACK_QUALITY = 0.3        # Control only acts on a track whose quality is at least this
 DEBUG         = False          # Verbose model output flag/Hides details when False
 
+# Latency budget: when frames take longer than this, step down the build_levels() ladder
+ADAPTIVE_QUALITY = True        # False pins the vision loop to the first (full quality) level
+LATENCY_BUDGET_MS = 1000 / CAM_FPS  # keep up with the camera
+LIGHT_WEIGHTS = None           # lighter fallback model (e.g. a smaller YOLO); its levels are skipped when None
+ROI_SIZE      = 480            # side of the window searched around the predicted track in ROI levels (frame pixels)
+ROI_INFER_SIZE = 160           # model input size in ROI levels: fewer pixels than the smallest full-frame level, finer detail
+REACQUIRE_SIZE = 320           # full-frame input size ROI levels fall back to while there is no track to search around
+
+# Tiled inference: run the model on overlapping native-resolution tiles so a distant drone is not downscaled away
+TILED         = False          # adds a "tiled" level above the others in the quality ladder
+TILE_SIZE     = INFER_SIZE     # tile side in frame pixels, also the model input size (no rescaling)
+TILE_NEIGHBOURHOOD = True      # tile only around the predicted track position between full-frame passes
+TILE_REGION   = TILE_SIZE      # side of the neighbourhood that is tiled (frame pixels); TILE_SIZE = a single tile
+TILE_FULL_EVERY = 15           # tile the whole frame every N frames (and whenever there is no track)
+TILE_WORKERS  = 0              # 0: all tiles in one batch call; N: a pool of N threads, each with its own model
+
 # We treat PROC_W×PROC_H as the size we run YOLO on, and OUT_W×OUT_H as the
 # size we draw/display or send coordinates in. Keeping them separate—even when
 # they’re currently equal—lets you:
@@ -27,16 +58,151 @@ DEBUG         = False          # Verbose model output flag/Hides details when Fa
 # Stores the last known drone position (x, y)
 last_location = None
 drone_location = None  # Current drone position for UDP logic
+drone_tracks = {}      # Track ID -> tracker.TrackState for every confirmed drone track (swarm mode)
+drone_track = None     # tracker.TrackState the single-drone mission follows
+track_quality = 0.0    # Quality (0..1) of drone_track, 0 when there is none
+drone_confirmed = False  # True while drone_track is confirmed and at least MIN_TRACK_QUALITY
+drone_tracker = tracker.Tracker(high_thr=CONF_THR, low_thr=LOW_CONF_THR)
+camera_mode = None     # (fourcc, width, height) the camera actually delivers, once it is open (keys the gain calibration)
+
+_model = None                  # Loaded and warmed-up model, shared by all callers
+_model_lock = threading.Lock() # Second caller waits for the first load instead of repeating it
+_light_model = None            # LIGHT_WEIGHTS model, loaded in the background on first use
+_light_loading = False
+_frame_index = 0               # Frames processed, for the detection cadence
+_display = None                # Reused buffer the mirrored, annotated frame is drawn into
+_tile_pool = None              # ThreadPoolExecutor for TILE_WORKERS, created by start_tile_pool()
+_tile_local = threading.local() # Per-worker model: Ultralytics predictors must not be shared between threads
+
+
+def build_levels(infer_size=INFER_SIZE, weights=WEIGHTS, light_weights=LIGHT_WEIGHTS, tiled=TILED):
+    """
+    Quality ladder for the latency controller, best first.
+
+    Tiled inference (when enabled) is the most expensive level and comes
+    first; then smaller inference sizes, ROI-only detection, the lighter
+    model, and finally a lower detection cadence. Exported .onnx models have
+    a fixed input size, so the size and ROI steps are left out for them (and
+    an .onnx LIGHT_WEIGHTS must be exported at infer_size).
+
+    Returns:
+        list: latency_budget.Level entries
+    """
+    Level = latency_budget.Level
+    levels = [Level("tiled", TILE_SIZE, TILE_NEIGHBOURHOOD, None, 1, True)] if tiled else []
+    if str(weights).endswith(".onnx"):
+        levels.append(Level(f"size{infer_size}", infer_size, False, None, 1))
+    else:
+        sizes = [infer_size] + [s for s in (480, 320) if s < infer_size]
+        levels += [Level(f"size{s}", s, False, None, 1) for s in sizes]
+        levels.append(Level(f"roi{ROI_INFER_SIZE}", ROI_INFER_SIZE, True, None, 1))
+    if light_weights:
+        fixed = str(light_weights).endswith(".onnx")
+        levels.append(Level(f"light-size{infer_size}", infer_size, False, light_weights, 1) if fixed
+                      else levels[-1]._replace(name=f"light-{levels[-1].name}", weights=light_weights))
+    last = levels[-1]
+    for cadence in (2, 3):
+        levels.append(last._replace(name=f"{last.name}-every{cadence}", cadence=cadence))
+    return levels
+
+
+def on_level_change(event):
+    print(f"[VISION] Quality level {event.old} -> {event.new} ({event.name}), "
+          f"frame {event.frame_ms:.1f} ms vs budget {event.budget_ms:.1f} ms")
+
+
+quality = latency_budget.LatencyBudget(build_levels(), LATENCY_BUDGET_MS)
+quality.subscribe(on_level_change)
+
+
+def load_model(weights=WEIGHTS):
+    """
+    Import Ultralytics, load the weights and run one warm-up inference.
+
+    Ultralytics/torch are imported here rather than at module import so the
+    rest of the app starts without paying for them. Safe to call from several
+    threads; only the first call does the work.
+
+    Returns:
+        YOLO: Ready-to-use model
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            from ultralytics import YOLO  # Ultralytics YOLO model API (heavy import)
+            startup.mark("ultralytics imported")
+            model = YOLO(weights, task="detect")  # task must be given for exported .onnx models
+            startup.mark("model loaded")
+            warm_up(model)
+            startup.mark("model warmed up")
+            if TILED and TILE_WORKERS:
+                start_tile_pool()
+                startup.mark("tile models warmed up")
+            _model = model
+    return _model
+
+
+def warm_up(model):
+    """
+    Run one inference on a blank frame so the first live frame does not pay
+    for graph setup and memory allocation.
+    """
+    model(np.zeros((PROC_H, PROC_W, 3), dtype=np.uint8), imgsz=INFER_SIZE, verbose=False)
+
+
+def model_for(level, model):
+    """
+    Returns:
+        The model to run at this quality level: the lighter one once it has loaded
+    """
+    global _light_loading
+    if level.weights is None:
+        return model
+    if _light_model is None and not _light_loading:
+        _light_loading = True
+        threading.Thread(target=load_light_model, args=(level.weights, level.infer_size),
+                         name="light-model-load", daemon=True).start()
+    return _light_model or model  # main model until the light one is ready
+
+
+def load_light_model(weights, imgsz):
+    global _light_model
+    from ultralytics import YOLO
+    model = YOLO(weights, task="detect")
+    model(np.zeros((PROC_H, PROC_W, 3), dtype=np.uint8), imgsz=imgsz, verbose=False)  # warm up off the vision thread
+    _light_model = model
+    print(f"[VISION] Light model {weights} ready")
+
+
+def roi_window(frame, scale_x, scale_y, size=ROI_SIZE):
+    """
+    Window around the followed track's predicted position, in camera
+    (unmirrored) frame pixels.
+
+    Returns:
+        (x0, y0, x1, y1) or None when there is no confirmed track to search around
+    """
+    if drone_track is None:
+        return None
+    h, w = frame.shape[:2]
+    dt = time.monotonic() - drone_track.stamp
+    px = w - (drone_track.x + drone_track.vx * dt) / scale_x        # output -> camera frame coordinates (undo the mirror)
+    py = (OUT_H - (drone_track.y + drone_track.vy * dt)) / scale_y
+    half = size // 2
+    x0 = int(min(max(px - half, 0), max(w - size, 0)))
+    y0 = int(min(max(py - half, 0), max(h - size, 0)))
+    return x0, y0, min(x0 + size, w), min(y0 + size, h)
 
 
 def initialize_camera():
     """
-    Open the video capture device and set its resolution.
+    Open the video capture device, negotiating MJPG (raw formats as fallback)
+    at PROC_W x PROC_H and CAM_FPS. Logs the format actually granted.
     """
-    cap = cv2.VideoCapture(CAM_IDX)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, PROC_W)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, PROC_H)
-    return cap
+    return camera.open_camera(
+        CAM_IDX, PROC_W, PROC_H, fps=CAM_FPS,
+        decode_width=INFER_SIZE if CAM_DECODE_JPEG else None
+    )
 
 
 def setup_display():
@@ -51,7 +217,7 @@ def setup_display():
     )
 
 
-def calculate_scale_factors():
+def calculate_scale_factors(frame_w=PROC_W, frame_h=PROC_H):
     """
     Compute the horizontal and vertical scale factors needed to map
     coordinates from the processing resolution (PROC_W × PROC_H) to
@@ -69,54 +235,215 @@ def calculate_scale_factors():
 
     This keeps bounding-box drawings and transmitted drone coordinates
     aligned properly whenever the display or output size differs from
-    the inference resolution.
+    the inference resolution. Pass the camera's actual frame size when it
+    differs from PROC_W × PROC_H (e.g. reduced-scale JPEG decode).
     """
-    scale_x = OUT_W / PROC_W
-    scale_y = OUT_H / PROC_H
+    scale_x = OUT_W / frame_w
+    scale_y = OUT_H / frame_h
     return scale_x, scale_y
 
 
-def process_frame(frame, model, scale_x, scale_y):
+def detect(model, frame, scale_x, scale_y, imgsz=INFER_SIZE, roi=None):
     """
-    Apply the YOLO model to a frame, annotate detections,
-    update drone position via udp_logic, and return annotated image.
+    Run the model on an unmirrored camera frame and return every drone candidate.
+
+    The user view is mirrored horizontally. Instead of flipping the pixels
+    before inference, the box coordinates are mirrored (x -> width - x), which
+    gives the same positions without a full-frame copy.
+
+    Args:
+        imgsz (int): Model input size
+        roi (tuple or None): (x0, y0, x1, y1) window of the camera frame to search instead of the whole frame
+    Returns:
+        list: (sx, sy, conf, (x1, y1, x2, y2)) per class-0 box with conf >= LOW_CONF_THR,
+              centre in output coordinates, box in mirrored frame pixels
     """
-    global last_location, drone_location
+    width = frame.shape[1]
+    # Run inference (with optional verbose output); keep weak boxes for the tracker
+    ox, oy = 0, 0
+    if roi is not None:
+        ox, oy, x1, y1 = roi
+        frame = frame[oy:y1, ox:x1]  # view, no copy
+    results = model(frame, imgsz=imgsz, conf=LOW_CONF_THR, verbose=DEBUG)
+    return to_candidates(drone_boxes(results[0], ox, oy), width, scale_x, scale_y)
 
-    # Mirror the frame horizontally for intuitive user view
-    frame = cv2.flip(frame, 1)
-    # Run inference (with optional verbose output)
-    results = model(frame, verbose=DEBUG)
-    boxes = results[0].boxes  # Detected bounding boxes
-    annotated = frame.copy()  # Copy frame for drawing
-    new_location = None       # To capture the first valid detection
 
-    # Iterate detections to find the drone (class ID 0)
-    for box in boxes:
+def drone_boxes(result, ox=0, oy=0):
+    """
+    Returns:
+        list: (x1, y1, x2, y2, conf) per class-0 box with conf >= LOW_CONF_THR,
+              shifted by (ox, oy) into camera frame pixels
+    """
+    boxes = []
+    for box in result.boxes:
         cls_id = int(box.cls[0])             # Class of detection
         conf = float(box.conf[0])            # Confidence score
-        if cls_id == 0 and conf >= CONF_THR: # Has to be a drone and have confidence over 0,5 (0 to 1)
+        if cls_id == 0 and conf >= LOW_CONF_THR: # Has to be a drone
             # Extract bounding box coordinates
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-            # Draw rectangle around the drone
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int) + (ox, oy, ox, oy)
+            boxes.append((x1, y1, x2, y2, conf))
+    return boxes
+
+
+def to_candidates(boxes, width, scale_x, scale_y):
+    """
+    Mirror camera-frame boxes into the user view and scale their centres to output coordinates.
+
+    Returns:
+        list: (sx, sy, conf, (x1, y1, x2, y2)) as returned by detect()
+    """
+    candidates = []
+    for rx1, y1, rx2, y2, conf in boxes:
+        x1, x2 = width - rx2, width - rx1  # mirror: left edge comes from the right one
+        # Compute center point and scale to output coordinates
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        sx = int(cx * scale_x)
+        sy = OUT_H - int(cy * scale_y)
+        candidates.append((sx, sy, conf, (x1, y1, x2, y2)))
+    return candidates
+
+
+def _tile_model():
+    """
+    Returns:
+        YOLO: This pool thread's own model instance (loaded here the first time)
+    """
+    if getattr(_tile_local, "model", None) is None:
+        from ultralytics import YOLO
+        _tile_local.model = YOLO(WEIGHTS, task="detect")
+    return _tile_local.model
+
+
+def start_tile_pool():
+    """
+    Create the TILE_WORKERS pool and load and warm every thread's model up
+    front. Loading them on the first tiled frame stalls it for seconds, and the
+    latency controller would drop the tiled level straight away.
+    """
+    global _tile_pool
+    if _tile_pool is not None:
+        return
+    ready = threading.Barrier(TILE_WORKERS)
+
+    def warm():
+        try:
+            _tile_model()(np.zeros((TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8), imgsz=TILE_SIZE, verbose=False)
+        except Exception:
+            ready.abort()  # release the other threads instead of leaving them waiting
+            raise
+        ready.wait()  # hold this thread so every warm-up lands on a thread of its own
+
+    pool = ThreadPoolExecutor(TILE_WORKERS, thread_name_prefix="tile")
+    for future in [pool.submit(warm) for _ in range(TILE_WORKERS)]:
+        future.result()
+    _tile_pool = pool
+
+
+def _infer_tiles(model, crops):
+    """
+    Run the model on every tile.
+
+    Returns:
+        list: One Ultralytics result per crop
+    """
+    if TILE_WORKERS:
+        start_tile_pool()  # already done by load_model when TILED is set
+        return list(_tile_pool.map(
+            lambda crop: _tile_model()(crop, imgsz=TILE_SIZE, conf=LOW_CONF_THR, verbose=DEBUG)[0], crops))
+    if str(WEIGHTS).endswith(".onnx"):
+        # Static-shape exports take one image per call
+        return [model(crop, imgsz=TILE_SIZE, conf=LOW_CONF_THR, verbose=DEBUG)[0] for crop in crops]
+    return model(crops, imgsz=TILE_SIZE, conf=LOW_CONF_THR, verbose=DEBUG)  # one batched forward pass
+
+
+def detect_tiled(model, frame, scale_x, scale_y, region=None):
+    """
+    Run the model on overlapping TILE_SIZE tiles at native resolution.
+
+    Args:
+        region (tuple or None): (x0, y0, x1, y1) camera-frame window to tile instead of the whole frame
+    Returns:
+        list: Candidates as returned by detect(), merged across tiles
+    """
+    h, w = frame.shape[:2]
+    tiles = tiling.tile_grid(w, h, TILE_SIZE, region=region)
+    crops = [frame[y0:y1, x0:x1] for x0, y0, x1, y1 in tiles]  # views, no copies
+    boxes = []
+    for (x0, y0, _, _), result in zip(tiles, _infer_tiles(model, crops)):
+        boxes += drone_boxes(result, x0, y0)
+    return to_candidates(tiling.merge(boxes), w, scale_x, scale_y)
+
+
+def process_frame(frame, model, scale_x, scale_y, annotate=True):
+    """
+    Apply the YOLO model to a frame, track detections, annotate them,
+    update drone position via udp_logic, and return annotated image.
+
+    Args:
+        frame (ndarray): Camera frame, unmirrored; it is only read
+        annotate (bool): Draw the mirrored, annotated view; False skips all pixel work
+    Returns:
+        ndarray or None: The annotated view (a reused buffer, overwritten by the
+        next call; copy it to keep it), or None when annotate is False
+    """
+    global last_location, drone_location, drone_tracks, drone_track, track_quality, drone_confirmed, _frame_index, _display
+
+    level = quality.level
+    _frame_index += 1
+    if _frame_index % level.cadence and drone_track is not None:
+        # Reduced cadence: skip detection and keep the last fix until the next detection frame
+        candidates = None
+    elif level.tiled:
+        # Neighbourhood of the predicted position, with a periodic full-frame pass to find new drones
+        full_pass = not level.roi or _frame_index % TILE_FULL_EVERY == 0
+        region = None if full_pass else roi_window(frame, scale_x, scale_y, TILE_REGION)
+        candidates = detect_tiled(model, frame, scale_x, scale_y, region)
+    else:
+        roi = roi_window(frame, scale_x, scale_y) if level.roi else None
+        imgsz = REACQUIRE_SIZE if level.roi and roi is None else level.infer_size
+        candidates = detect(model_for(level, model), frame, scale_x, scale_y, imgsz, roi)
+
+    annotated = None
+    if annotate:
+        # Mirror the frame horizontally for intuitive user view, straight into the display buffer
+        reuse = _display is not None and _display.shape == frame.shape
+        _display = cv2.flip(frame, 1, dst=_display if reuse else None)
+        annotated = _display
+
+        for sx, sy, conf, (x1, y1, x2, y2) in candidates or ():
+            strong = conf >= CONF_THR
+            # Red for confident detections, orange for weak candidates
             cv2.rectangle(
                 annotated, (x1, y1), (x2, y2),
-                (0, 0, 255), 2
-            )
-            # Compute center point and scale to output coordinates
-            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
-            sx = int(cx * scale_x)
-            sy = OUT_H - int(cy * scale_y)
-            # Annotate coordinates on the frame
-            label = f"({sx},{sy})"
-            cv2.putText(
-                annotated, label,
-                (x1, y1 - 10),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.9, (0, 0, 255), 2
+                (0, 0, 255) if strong else (0, 165, 255), 2 if strong else 1
             )
-            new_location = (sx, sy)
-            break  # Only consider the first valid detection
+
+    if candidates is not None:
+        # Associate with existing tracks; a lone false positive stays a tentative track
+        tracks = drone_tracker.update([(sx, sy, conf) for sx, sy, conf, _ in candidates])
+        drone_tracks = {tid: t for tid, t in tracks.items() if t.confirmed}
+        drone_track = drone_tracker.primary()
+        track_quality = drone_track.quality if drone_track else 0.0
+        drone_confirmed = track_quality >= MIN_TRACK_QUALITY
+
+    new_location = None
+    if drone_track is not None and drone_track.misses == 0:
+        new_location = (int(drone_track.x), int(drone_track.y))
+    if new_location and annotate:
+        # Annotate track identity, quality and coordinates on the frame
+        label = f"#{drone_track.id} q={track_quality:.2f} ({new_location[0]},{new_location[1]})"
+        draw_x = int(new_location[0] / scale_x)
+        draw_y = int((OUT_H - new_location[1]) / scale_y)
+        cv2.putText(
+            annotated, label,
+            (draw_x, max(draw_y - 30, 20)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.9, (0, 0, 255), 2
+        )
+
+    if new_location and last_location is None:
+        startup.mark("first fix")
+        startup.report()
 
     # Update UDP logic with new or last known location
     if new_location:
@@ -128,23 +455,45 @@ def process_frame(frame, model, scale_x, scale_y):
     return annotated
 
 
-def main_loop(cap, model, scale_x, scale_y):
+def main_loop(cap, model, scale_x, scale_y, display=True, publish=None, stop_event=None):
     """
     Capture frames in a loop, process and display them,
     exit on 'q' key press.
+
+    Args:
+        display (bool): Show the annotated frame in the OpenCV window
+        publish (callable or None): Called with each annotated frame after processing
+        stop_event (Event or None): Loop exits once this event is set
     """
+    buf = None  # capture buffer, handed back to the camera every frame
     while cap.isOpened():
-        success, frame = cap.read()
+        if stop_event is not None and stop_event.is_set():
+            break
+
+        success, frame = cap.read(image=buf) if buf is not None else cap.read()
         if not success:
             print("[VISION] Frame grab failed, exiting.")
             break
+        buf = frame  # nothing keeps the frame past this iteration, so the next read may overwrite it
 
-        annotated = process_frame(frame, model, scale_x, scale_y)
-        cv2.imshow("YOLO Inference", annotated) # Display frames
+        # Only draw when someone looks at the result
+        watched = monitor_server.external.wants_frames()
+        started = time.perf_counter()
+        annotated = process_frame(frame, model, scale_x, scale_y,
+                                  annotate=display or publish is not None or watched)
+        if ADAPTIVE_QUALITY:
+            quality.record((time.perf_counter() - started) * 1000) # May change the level for the next frame
+        if publish is not None:
+            publish(annotated) # Hand the frame and position to other processes
+        if watched:
+            monitor_server.external.publish(annotated.copy()) # The display buffer is reused next frame
 
-        # Exit loop if 'q' is pressed
-        if cv2.waitKey(1) & 0xFF == ord("q"):
-            break
+        if display:
+            cv2.imshow("YOLO Inference", annotated) # Display frames
+
+            # Exit loop if 'q' is pressed
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                break
 
 
 def run():
@@ -152,10 +501,14 @@ def run():
     Entry point: initialize model, camera, display settings,
     then start the main processing loop.
     """
-    model = YOLO(WEIGHTS) # initialize YOLO model with specified weights
+    global camera_mode
+    threading.Thread(target=load_model, name="model-load", daemon=True).start() # Load and warm up the model in parallel
     cap = initialize_camera() # Starts camera
+    startup.mark("camera open")
+    camera_mode = (cap.fourcc, *cap.frame_size)
     setup_display() # Starts Window display
-    scale_x, scale_y = calculate_scale_factors() # Scale factors for coordinates
+    model = load_model() # Waits for the background load if it is still running
+    scale_x, scale_y = calculate_scale_factors(*cap.frame_size) # Scale factors for coordinates
 
     main_loop(cap, model, scale_x, scale_y) # Grab frame, process frame, show frame, repeat!
 
@@ -165,5 +518,51 @@ def run():
     print("[VISION] Thread ending.")
 
 
+def run_process(frame_shm, position_shm, stop_event, mode=None, fix_event=None):
+    """
+    Entry point for the vision process in the multi-process layout.
+
+    Runs headless and publishes every position and annotated frame into the
+    shared-memory buffers created by the parent; the parent owns the display.
+
+    Args:
+        frame_shm (str): Name of the vision_shm.FrameBuffer block
+        position_shm (str): Name of the vision_shm.PositionBuffer block
+        stop_event (Event): Set by the parent to request a clean shutdown
+        mode (multiprocessing.Array or None): Receives the negotiated camera mode
+            as "FOURCC WIDTH HEIGHT", for the parent's camera_mode
+        fix_event (Event or None): Set on every position write to wake the parent's reader
+    """
+    frames = vision_shm.FrameBuffer.attach(frame_shm)
+    positions = vision_shm.PositionBuffer.attach(position_shm, event=fix_event)
+    frame_h, frame_w, _ = frames.shape
+
+    def publish(annotated):
+        positions.write(drone_location, track_quality if drone_confirmed else 0.0) # Position first: it is what the mission waits on
+        if annotated.shape[:2] == (frame_h, frame_w):
+            frames.write(annotated)
+        else:
+            slot, view = frames.begin_write()
+            cv2.resize(annotated, (frame_w, frame_h), dst=view) # Camera gave a different size
+            frames.end_write(slot)
+
+    threading.Thread(target=load_model, name="model-load", daemon=True).start() # Load and warm up the model in parallel
+    cap = initialize_camera() # Starts camera
+    startup.mark("camera open")
+    if mode is not None:
+        mode.value = " ".join(map(str, (cap.fourcc, *cap.frame_size))).encode() # Set before the first position is published
+    model = load_model() # Waits for the background load if it is still running
+    scale_x, scale_y = calculate_scale_factors(*cap.frame_size) # Scale factors for coordinates
+
+    try:
+        main_loop(cap, model, scale_x, scale_y,
+                  display=False, publish=publish, stop_event=stop_event)
+    finally:
+        cap.release()
+        frames.close()
+        positions.close()
+        print("[VISION] Process ending.")
+
+
 if __name__ == "__main__":
     run()